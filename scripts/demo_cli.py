@@ -5,21 +5,37 @@ Provides a simple command-line interface to test core functionality.
 """
 
 import os
+import io
 import argparse
 import logging
-import csv
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
+
+import pandas as pd
+import requests
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from requests.adapters import HTTPAdapter
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload, sessionmaker
+from urllib3.util.retry import Retry
 
 from songwriter_id.api.musicbrainz import MusicBrainzClient
 from songwriter_id.api.acoustid import AcoustIDClient
 from songwriter_id.audio.fingerprinting import AudioProcessor
+from songwriter_id.database.connection import create_db_engine
 from songwriter_id.database.models import Base, Track, SongwriterCredit, IdentificationAttempt
 
+# Use orjson for faster serialization of attempt results if available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +43,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of catalog rows sent per bulk INSERT
+IMPORT_BATCH_SIZE = 10000
+# Catalog CSV columns mapped to Track fields
+CATALOG_COLUMNS = {
+    'title': 'title',
+    'artist': 'artist_name',
+    'release': 'release_title',
+    'duration': 'duration',
+    'audio_path': 'audio_path',
+}
+# Default number of tracks identified concurrently
+IDENTIFY_WORKERS = 8
+# Database connections kept open for concurrent identification
+DB_POOL_SIZE = 32
+
+
+def _to_json(obj) -> str:
+    """Serialize an object to a JSON string, preferring orjson when installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
 
 class DemoApp:
     """Demo application for the songwriter identification system."""
@@ -38,32 +76,58 @@ class DemoApp:
             db_url: Database connection URL
         """
         self.db_url = db_url
-        self.engine = create_engine(db_url)
-        self.Session = sessionmaker(bind=self.engine)
+        # Size the pool so every identification worker can hold a connection
+        self.engine = create_db_engine(
+            db_url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=0,
+            pool_pre_ping=True
+        )
+        self.Session = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        
+        # Shared HTTP session so API calls reuse pooled keep-alive connections
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.http_session.mount('https://', adapter)
+        self.http_session.mount('http://', adapter)
         
         # Initialize API clients
         self.mb_client = MusicBrainzClient(
             app_name="SongwriterID",
             version="0.1.0",
-            contact=os.environ.get("CONTACT_EMAIL", "admin@example.com")
+            contact=os.environ.get("CONTACT_EMAIL", "admin@example.com"),
+            http_session=self.http_session
         )
         
         self.acoustid_client = None
         if os.environ.get("ACOUSTID_API_KEY"):
             self.acoustid_client = AcoustIDClient(
-                api_key=os.environ["ACOUSTID_API_KEY"]
+                api_key=os.environ["ACOUSTID_API_KEY"],
+                http_session=self.http_session
             )
         
         self.audio_processor = AudioProcessor()
 
     def setup_database(self):
         """Set up the database schema."""
-        Base.metadata.create_all(self.engine)
+        # Create any missing tables in a single DDL transaction
+        with self.engine.begin() as conn:
+            Base.metadata.create_all(conn, checkfirst=True)
         logger.info("Database tables created")
 
     def import_catalog(self, catalog_path: str):
         """Import a catalog file into the database.
 
+        Rows whose (title, artist_name) pair already exists are skipped. When
+        the tracks table has a unique (title, artist_name) index, added by
+        scripts/migrate_add_title_artist_index.py --unique, the database skips
+        them with ON CONFLICT DO NOTHING; otherwise the existing pairs are
+        loaded once and matching rows are dropped before each insert.
+
         Args:
             catalog_path: Path to the catalog CSV file
         """
@@ -71,29 +135,41 @@ class DemoApp:
         
         try:
             logger.info(f"Importing catalog from {catalog_path}")
-            with open(catalog_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
+            # Parse the CSV in vectorized chunks, one bulk INSERT per chunk
+            chunks = pd.read_csv(catalog_path, dtype=str, keep_default_na=False,
+                                 encoding='utf-8', chunksize=IMPORT_BATCH_SIZE)
+            
+            # PostgreSQL loads rows much faster through COPY than INSERT
+            use_copy = self.engine.dialect.name == 'postgresql' and self.engine.driver == 'psycopg2'
+            
+            skip_conflicts = self._has_unique_title_artist_index()
+            insert_stmt = self._insert_tracks_statement() if skip_conflicts else insert(Track)
+            existing = None if skip_conflicts else {
+                tuple(row) for row in session.execute(select(Track.title, Track.artist_name))}
+            
+            track_count = 0
+            for chunk in chunks:
+                # Columns missing from the file import as empty strings
+                chunk = chunk.reindex(columns=list(CATALOG_COLUMNS), fill_value='')
+                chunk = chunk.rename(columns=CATALOG_COLUMNS)
                 
-                track_count = 0
-                for row in reader:
-                    track = Track(
-                        title=row.get('title', ''),
-                        artist_name=row.get('artist', ''),
-                        release_title=row.get('release', ''),
-                        duration=float(row.get('duration', 0)) if row.get('duration') else None,
-                        audio_path=row.get('audio_path', ''),
-                        identification_status='pending'
-                    )
-                    session.add(track)
-                    track_count += 1
-                    
-                    # Commit in batches to avoid memory issues
-                    if track_count % 100 == 0:
-                        session.commit()
-                        logger.info(f"Imported {track_count} tracks...")
+                durations = pd.to_numeric(chunk['duration'].where(chunk['duration'] != ''))
+                chunk['duration'] = durations.astype(object).where(durations.notna(), None)
+                chunk['identification_status'] = 'pending'
+                
+                rows = len(chunk)
+                if existing is not None:
+                    chunk = self._drop_existing_tracks(chunk, existing)
                 
-                session.commit()
-                logger.info(f"Successfully imported {track_count} tracks")
+                if use_copy and not chunk.empty:
+                    self._copy_tracks(session, chunk, skip_conflicts)
+                elif not chunk.empty:
+                    session.execute(insert_stmt, chunk.to_dict(orient='records'))
+                track_count += rows
+                logger.info(f"Processed {track_count} catalog rows...")
+            
+            session.commit()
+            logger.info(f"Successfully imported {track_count} catalog rows (existing tracks skipped)")
         
         except Exception as e:
             session.rollback()
@@ -101,6 +177,93 @@ class DemoApp:
         finally:
             session.close()
 
+    def _has_unique_title_artist_index(self) -> bool:
+        """Check whether the tracks table has a unique (title, artist_name) index.
+
+        Returns:
+            True if ON CONFLICT (title, artist_name) can be used on the tracks table
+        """
+        inspector = inspect(self.engine)
+        unique_columns = [index['column_names'] for index in inspector.get_indexes(Track.__tablename__)
+                          if index['unique']]
+        unique_columns += [constraint['column_names'] for constraint
+                           in inspector.get_unique_constraints(Track.__tablename__)]
+        return any(sorted(columns) == ['artist_name', 'title'] for columns in unique_columns)
+
+    @staticmethod
+    def _drop_existing_tracks(chunk: pd.DataFrame, existing: set) -> pd.DataFrame:
+        """Drop catalog rows whose (title, artist_name) pair is already imported.
+
+        Args:
+            chunk: DataFrame of catalog rows
+            existing: (title, artist_name) pairs already in the database; the
+                pairs of the kept rows are added to it
+
+        Returns:
+            Rows of chunk with new pairs, keeping the first of any repeats
+        """
+        keep = []
+        for key in zip(chunk['title'], chunk['artist_name']):
+            keep.append(key not in existing)
+            existing.add(key)
+        return chunk[keep]
+
+    def _insert_tracks_statement(self):
+        """Build the bulk INSERT statement for catalog rows.
+
+        Returns:
+            Insert statement that skips existing (title, artist_name) pairs on
+            PostgreSQL and SQLite, or a plain insert on other databases
+        """
+        dialect = self.engine.dialect.name
+        if dialect == 'postgresql':
+            return pg_insert(Track).on_conflict_do_nothing(index_elements=['title', 'artist_name'])
+        if dialect == 'sqlite':
+            return sqlite_insert(Track).on_conflict_do_nothing(index_elements=['title', 'artist_name'])
+        return insert(Track)
+
+    def _copy_tracks(self, session, chunk: pd.DataFrame, skip_conflicts: bool = False):
+        """Load a chunk of catalog rows into the tracks table with PostgreSQL COPY.
+
+        COPY cannot skip conflicting rows, so with skip_conflicts the chunk is
+        copied into a temporary staging table and moved into tracks with
+        ON CONFLICT DO NOTHING.
+
+        Args:
+            session: Database session whose transaction the rows are loaded in
+            chunk: DataFrame with columns matching the tracks table
+            skip_conflicts: Skip rows that conflict on the unique
+                (title, artist_name) index
+        """
+        columns = ', '.join(chunk.columns)
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        
+        # Empty text fields load as empty strings; only a missing duration is NULL
+        text_columns = ', '.join(c for c in chunk.columns if c != 'duration')
+        copy_sql = f"FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({text_columns}))"
+        cursor = session.connection().connection.cursor()
+        try:
+            if not skip_conflicts:
+                cursor.copy_expert(f"COPY tracks ({columns}) {copy_sql}", buffer)
+                return
+            
+            # Only the copied columns, without the track_id sequence default,
+            # so staged rows do not draw IDs that the INSERT draws again
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS tracks_staging ON COMMIT DROP "
+                f"AS SELECT {columns} FROM tracks WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY tracks_staging ({columns}) {copy_sql}", buffer)
+            cursor.execute(
+                f"INSERT INTO tracks ({columns}) SELECT {columns} FROM tracks_staging "
+                f"ON CONFLICT (title, artist_name) DO NOTHING"
+            )
+            cursor.execute("TRUNCATE tracks_staging")
+        finally:
+            cursor.close()
+
     def identify_track(self, track_id: int):
         """Run identification process for a single track.
 
@@ -110,24 +273,38 @@ class DemoApp:
         session = self.Session()
         
         try:
-            track = session.query(Track).get(track_id)
+            track = session.get(Track, track_id)
             if not track:
                 logger.error(f"Track with ID {track_id} not found")
                 return
             
             logger.info(f"Identifying track: {track.title} by {track.artist_name}")
             
+            # Start the MusicBrainz search and the AcoustID lookup concurrently so
+            # the fingerprint result is ready if the metadata lookup comes up empty
+            can_fingerprint = bool(
+                track.audio_path and os.path.exists(track.audio_path) and self.acoustid_client)
+            executor = ThreadPoolExecutor(max_workers=2)
+            try:
+                mb_future = executor.submit(
+                    self.mb_client.search_recording, track.title, track.artist_name)
+                acoustid_future = None
+                if can_fingerprint:
+                    acoustid_future = executor.submit(
+                        self.acoustid_client.identify_track, track.audio_path)
+            finally:
+                executor.shutdown(wait=False)
+            
             # Step 1: Try MusicBrainz metadata lookup
-            mb_recordings = self.mb_client.search_recording(track.title, track.artist_name)
+            mb_recordings = mb_future.result()
             
-            # Log the attempt
-            attempt = IdentificationAttempt(
-                track_id=track.track_id,
-                source_used="musicbrainz",
-                query_performed=f"title={track.title}, artist={track.artist_name}",
-                result=json.dumps(mb_recordings[:5] if mb_recordings else [])
-            )
-            session.add(attempt)
+            # Log the attempt; attempts are inserted together before committing
+            attempts = [{
+                'track_id': track.track_id,
+                'source_used': "musicbrainz",
+                'query_performed': f"title={track.title}, artist={track.artist_name}",
+                'result': _to_json(mb_recordings[:5] if mb_recordings else [])
+            }]
             
             if mb_recordings:
                 logger.info(f"Found {len(mb_recordings)} potential matches on MusicBrainz")
@@ -139,44 +316,45 @@ class DemoApp:
                     
                     if recording_id:
                         # Get songwriter credits
+                        # Recording and work lookups are memoized by the client, and
+                        # failed lookups are not cached
                         credits = self.mb_client.get_work_credits(recording_id)
                         
                         if credits:
                             logger.info(f"Found {len(credits)} songwriter credits")
                             
-                            # Add credits to database
-                            for credit in credits:
-                                songwriter_credit = SongwriterCredit(
-                                    track_id=track.track_id,
-                                    songwriter_name=credit.get('name', ''),
-                                    role=credit.get('role', ''),
-                                    source_of_info='musicbrainz',
-                                    confidence_score=0.9  # High confidence for MB matches
-                                )
-                                session.add(songwriter_credit)
+                            # Build credit rows for a single multi-row insert
+                            credit_rows = [{
+                                'track_id': track.track_id,
+                                'songwriter_name': credit.get('name', ''),
+                                'role': credit.get('role', ''),
+                                'source_of_info': 'musicbrainz',
+                                'confidence_score': 0.9  # High confidence for MB matches
+                            } for credit in credits]
                             
                             # Update track status
                             track.identification_status = 'identified'
                             track.confidence_score = 0.9
+                            session.execute(insert(SongwriterCredit), credit_rows)
+                            session.execute(insert(IdentificationAttempt), attempts)
                             session.commit()
                             
                             return True
             
             # Step 2: If we have audio path and AcoustID configured, try audio fingerprinting
-            if track.audio_path and os.path.exists(track.audio_path) and self.acoustid_client:
+            if acoustid_future is not None:
                 logger.info(f"Trying audio fingerprinting for {track.title}")
                 
                 # Identify track using AcoustID
-                matches = self.acoustid_client.identify_track(track.audio_path)
+                matches = acoustid_future.result()
                 
                 # Log the attempt
-                attempt = IdentificationAttempt(
-                    track_id=track.track_id,
-                    source_used="acoustid",
-                    query_performed=f"audio_file={track.audio_path}",
-                    result=json.dumps(matches[:5] if matches else [])
-                )
-                session.add(attempt)
+                attempts.append({
+                    'track_id': track.track_id,
+                    'source_used': "acoustid",
+                    'query_performed': f"audio_file={track.audio_path}",
+                    'result': _to_json(matches[:5] if matches else [])
+                })
                 
                 if matches:
                     logger.info(f"Found {len(matches)} matches via audio fingerprinting")
@@ -186,6 +364,7 @@ class DemoApp:
             # If we get here, identification failed
             logger.info(f"Could not identify songwriter credits for {track.title}")
             track.identification_status = 'manual_review'
+            session.execute(insert(IdentificationAttempt), attempts)
             session.commit()
             return False
             
@@ -196,48 +375,110 @@ class DemoApp:
         finally:
             session.close()
 
+    def identify_all_pending(self, workers: int = IDENTIFY_WORKERS):
+        """Run identification for all pending tracks using a pool of workers.
+
+        Args:
+            workers: Number of tracks to identify concurrently
+
+        Returns:
+            Tuple of (identified_count, unidentified_count)
+        """
+        session = self.Session()
+        
+        try:
+            track_ids = [
+                track_id for (track_id,) in session.query(Track.track_id)
+                .filter_by(identification_status='pending')
+                .yield_per(1000)
+            ]
+        finally:
+            session.close()
+        
+        logger.info(f"Identifying {len(track_ids)} pending tracks with {workers} workers")
+        
+        # Each identify_track call uses its own session, so tracks can run in parallel
+        identified = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(self.identify_track, track_ids):
+                if result:
+                    identified += 1
+        
+        unidentified = len(track_ids) - identified
+        logger.info(f"Identified {identified} tracks, {unidentified} sent for manual review")
+        return identified, unidentified
+
     def display_track(self, track_id: int):
         """Display track details including songwriter credits.
 
         Args:
             track_id: ID of the track to display
         """
+        self.display_tracks([track_id])
+
+    def display_tracks(self, track_ids: List[int]):
+        """Display details and songwriter credits for several tracks.
+
+        Tracks and their credits are loaded with one session and two queries,
+        regardless of how many tracks are displayed.
+
+        Args:
+            track_ids: IDs of the tracks to display
+        """
         session = self.Session()
         
         try:
-            track = session.query(Track).get(track_id)
-            if not track:
-                logger.error(f"Track with ID {track_id} not found")
-                return
-            
-            print("\n" + "=" * 50)
-            print(f"Track ID: {track.track_id}")
-            print(f"Title: {track.title}")
-            print(f"Artist: {track.artist_name}")
-            print(f"Release: {track.release_title}")
-            print(f"Status: {track.identification_status}")
-            print(f"Confidence: {track.confidence_score:.2f}")
-            print("-" * 50)
+            query = (
+                select(Track)
+                .where(Track.track_id.in_(track_ids))
+                .options(selectinload(Track.songwriter_credits))
+                .order_by(Track.track_id)
+                .execution_options(yield_per=1000)
+            )
             
-            credits = session.query(SongwriterCredit).filter_by(track_id=track.track_id).all()
-            if credits:
-                print("Songwriter Credits:")
-                for credit in credits:
-                    print(f"  - {credit.songwriter_name} ({credit.role})")
-                    if credit.publisher_name:
-                        print(f"    Publisher: {credit.publisher_name}")
-                    print(f"    Source: {credit.source_of_info}")
-                    print(f"    Confidence: {credit.confidence_score:.2f}")
-            else:
-                print("No songwriter credits found")
+            found_ids = set()
+            for track in session.execute(query).scalars():
+                found_ids.add(track.track_id)
+                self._print_track(track)
             
-            print("=" * 50 + "\n")
+            for track_id in track_ids:
+                if track_id not in found_ids:
+                    logger.error(f"Track with ID {track_id} not found")
             
         except Exception as e:
             logger.error(f"Error displaying track: {e}")
         finally:
             session.close()
 
+    def _print_track(self, track: Track):
+        """Print a track and its loaded songwriter credits.
+
+        Args:
+            track: Track with songwriter_credits loaded
+        """
+        print("\n" + "=" * 50)
+        print(f"Track ID: {track.track_id}")
+        print(f"Title: {track.title}")
+        print(f"Artist: {track.artist_name}")
+        print(f"Release: {track.release_title}")
+        print(f"Status: {track.identification_status}")
+        print(f"Confidence: {track.confidence_score:.2f}")
+        print("-" * 50)
+        
+        credits = track.songwriter_credits
+        if credits:
+            print("Songwriter Credits:")
+            for credit in credits:
+                print(f"  - {credit.songwriter_name} ({credit.role})")
+                if credit.publisher_name:
+                    print(f"    Publisher: {credit.publisher_name}")
+                print(f"    Source: {credit.source_of_info}")
+                print(f"    Confidence: {credit.confidence_score:.2f}")
+        else:
+            print("No songwriter credits found")
+        
+        print("=" * 50 + "\n")
+
 
 def main():
     """Main entry point for the script."""
@@ -245,7 +486,10 @@ def main():
     parser.add_argument('--setup', action='store_true', help='Set up the database')
     parser.add_argument('--import', dest='import_path', help='Import a catalog CSV file')
     parser.add_argument('--identify', type=int, help='Identify a specific track by ID')
-    parser.add_argument('--display', type=int, help='Display a track by ID')
+    parser.add_argument('--identify-pending', action='store_true', help='Identify all pending tracks')
+    parser.add_argument('--workers', type=int, default=IDENTIFY_WORKERS,
+                        help='Number of tracks to identify concurrently')
+    parser.add_argument('--display', type=int, nargs='+', help='Display one or more tracks by ID')
     args = parser.parse_args()
     
     # Load environment variables from .env file
@@ -269,8 +513,11 @@ def main():
         if args.identify:
             demo.identify_track(args.identify)
         
+        if args.identify_pending:
+            demo.identify_all_pending(workers=args.workers)
+        
         if args.display:
-            demo.display_track(args.display)
+            demo.display_tracks(args.display)
             
         return 0
     except Exception as e:
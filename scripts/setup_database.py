@@ -8,7 +8,7 @@ import os
 import argparse
 import logging
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from songwriter_id.database.connection import create_db_engine
 from songwriter_id.database.models import Base
 
 # Configure logging
@@ -27,14 +27,16 @@ def setup_database(db_url: str, drop_existing: bool = False):
         drop_existing: Whether to drop existing tables
     """
     logger.info(f"Connecting to database: {db_url}")
-    engine = create_engine(db_url)
+    engine = create_db_engine(db_url)
     
-    if drop_existing:
-        logger.warning("Dropping existing tables...")
-        Base.metadata.drop_all(engine)
-    
-    logger.info("Creating tables...")
-    Base.metadata.create_all(engine)
+    # Drop and create tables in a single DDL transaction
+    with engine.begin() as conn:
+        if drop_existing:
+            logger.warning("Dropping existing tables...")
+            Base.metadata.drop_all(conn)
+        
+        logger.info("Creating tables...")
+        Base.metadata.create_all(conn, checkfirst=True)
     logger.info("Database setup complete!")
 
 def main():
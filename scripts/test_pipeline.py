@@ -61,22 +61,23 @@ def print_database_stats(db_url):
     session = Session()
     
     try:
-        # Count tracks
-        track_count = session.execute(text("SELECT COUNT(*) FROM tracks")).scalar()
+        # Count tracks, songwriter credits and identification attempts in one round trip
+        counts = {name: count for name, count in session.execute(text(
+            "SELECT 'tracks', COUNT(*) FROM tracks "
+            "UNION ALL SELECT 'credits', COUNT(*) FROM songwriter_credits "
+            "UNION ALL SELECT 'attempts', COUNT(*) FROM identification_attempts"
+        ))}
+        track_count = counts['tracks']
+        credit_count = counts['credits']
+        attempt_count = counts['attempts']
         print(f"Total tracks: {track_count}")
-        
-        # Count songwriter credits
-        credit_count = session.execute(text("SELECT COUNT(*) FROM songwriter_credits")).scalar()
         print(f"Total songwriter credits: {credit_count}")
-        
-        # Count identification attempts
-        attempt_count = session.execute(text("SELECT COUNT(*) FROM identification_attempts")).scalar()
         print(f"Total identification attempts: {attempt_count}")
         
         # Identification status breakdown
         status_counts = session.execute(text(
             "SELECT identification_status, COUNT(*) FROM tracks GROUP BY identification_status"
-        )).fetchall()
+        ))
         
         print("\nIdentification Status Breakdown:")
         for status, count in status_counts:
@@ -87,7 +88,7 @@ def print_database_stats(db_url):
             top_songwriters = session.execute(text(
                 "SELECT songwriter_name, role, COUNT(*) as count FROM songwriter_credits "
                 "GROUP BY songwriter_name, role ORDER BY count DESC LIMIT 10"
-            )).fetchall()
+            ))
             
             print("\nTop Identified Songwriters:")
             for name, role, count in top_songwriters:
@@ -2,10 +2,11 @@
 
 import os
 import sys
-import time
 import logging
 import argparse
+import functools
 import signal
+import threading
 from dotenv import load_dotenv
 
 # Configure logging
@@ -21,19 +22,29 @@ logger = logging.getLogger(__name__)
 # Try to import yaml, but provide a fallback
 try:
     import yaml
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    try:
+        from yaml import CSafeLoader as _SafeLoader
+    except ImportError:
+        from yaml import SafeLoader as _SafeLoader
     HAS_YAML = True
 except ImportError:
     logger.warning("PyYAML not installed, will use default configuration")
     HAS_YAML = False
 
-# Import after configure logging
+# Import after configure logging. The pipeline and scheduler pull in pandas
+# and the API clients, so they are imported only once a mode needs them.
 from songwriter_id.database.setup import setup_database, create_session
-from songwriter_id.pipeline import SongwriterIdentificationPipeline
-from songwriter_id.scheduler import JobScheduler
 
 # Global variable to store the scheduler so it can be stopped on SIGTERM
 scheduler = None
 
+# Parsed configurations keyed by (path, modification time)
+_CONFIG_CACHE = {}
+
+# Seconds between status log lines while the daemon is waiting for a signal
+STATUS_LOG_INTERVAL = 60
+
 def load_config(config_path):
     """Load configuration from YAML file.
     
@@ -48,19 +59,40 @@ def load_config(config_path):
         return {}
         
     try:
-        with open(config_path, 'r') as config_file:
-            config = yaml.safe_load(config_file)
-            logger.info(f"Loaded configuration with {len(config.keys()) if config else 0} sections")
-            return config
+        cache_key = (os.path.abspath(config_path), os.stat(config_path).st_mtime_ns)
+        if cache_key in _CONFIG_CACHE:
+            return _CONFIG_CACHE[cache_key]
+        
+        with open(config_path, 'rb') as config_file:
+            config = yaml.load(config_file, Loader=_SafeLoader) or {}
+            logger.info("Loaded configuration with %d sections", len(config))
+        
+        _CONFIG_CACHE[cache_key] = config
+        return config
     except Exception as e:
-        logger.warning(f"Failed to load config file {config_path}: {e}")
+        logger.warning("Failed to load config file %s: %s", config_path, e)
         return {}
 
+class EnvDefault(argparse.Action):
+    """Argparse action that falls back to an environment variable.
+    
+    The environment is read once when the argument is declared, so the
+    resolved default also shows up in the help text.
+    """
+    
+    def __init__(self, envvar, required=True, default=None, **kwargs):
+        default = os.environ.get(envvar, default)
+        required = required and default is None
+        super().__init__(default=default, required=required, **kwargs)
+    
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, values)
+
 def signal_handler(sig, frame):
     """Handle signals like SIGTERM and SIGINT by gracefully shutting down."""
     global scheduler
     
-    logger.info(f"Received signal {sig}, shutting down...")
+    logger.info("Received signal %s, shutting down...", sig)
     
     if scheduler:
         logger.info("Stopping job scheduler...")
@@ -69,34 +101,85 @@ def signal_handler(sig, frame):
     logger.info("Shutdown complete.")
     sys.exit(0)
 
-def main():
-    """Main entry point for the application."""
-    global scheduler
+def _log_scheduler_status(scheduler):
+    """Log the job the scheduler is processing, if any."""
+    if scheduler.current_job:
+        logger.info("Currently running job %s", scheduler.current_job)
+
+def _run_scheduler_until_signal(scheduler):
+    """Start the scheduler and block until SIGTERM or SIGINT arrives.
     
+    Where the platform supports it, the shutdown signals are blocked before
+    the scheduler thread starts, so it inherits the mask, and the main thread
+    sleeps in sigtimedwait. Elsewhere, such as on Windows, signal handlers
+    set an event the main thread waits on. Either way the main thread wakes
+    every STATUS_LOG_INTERVAL seconds to log the running job.
+    
+    Args:
+        scheduler: JobScheduler to start
+        
+    Returns:
+        Number of the signal that was received
+    """
+    shutdown_signals = {signal.SIGTERM, signal.SIGINT}
+    
+    if hasattr(signal, "pthread_sigmask") and hasattr(signal, "sigtimedwait"):
+        signal.pthread_sigmask(signal.SIG_BLOCK, shutdown_signals)
+        scheduler.start()
+        while True:
+            info = signal.sigtimedwait(shutdown_signals, STATUS_LOG_INTERVAL)
+            if info is not None:
+                return info.si_signo
+            _log_scheduler_status(scheduler)
+    
+    stop_event = threading.Event()
+    received = []
+    
+    def handle_shutdown(sig, frame):
+        received.append(sig)
+        stop_event.set()
+    
+    for sig in shutdown_signals:
+        signal.signal(sig, handle_shutdown)
+    scheduler.start()
+    while not stop_event.wait(timeout=STATUS_LOG_INTERVAL):
+        _log_scheduler_status(scheduler)
+    return received[0]
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the command line parser once per process.
+    
+    Returns:
+        Argument parser
+    """
     parser = argparse.ArgumentParser(description='Songwriter Identification System')
     parser.add_argument('--config', default='config/pipeline.yaml', help='Path to configuration file')
     parser.add_argument('--catalog', help='Path to catalog CSV file to process')
     parser.add_argument('--audio-path', help='Base path for audio files')
-    parser.add_argument('--db-url', help='Database connection URL (overrides environment variable)')
+    parser.add_argument('--db-url', action=EnvDefault, envvar='DATABASE_URL',
+                        help='Database connection URL (default: DATABASE_URL environment variable)')
     parser.add_argument('--daemon', action='store_true', help='Run as a daemon with job scheduler')
     parser.add_argument('--jobs-dir', default='data/jobs', help='Directory for job files')
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """Main entry point for the application."""
+    global scheduler
+    
+    # Load environment variables from .env file before resolving argument defaults
+    load_dotenv()
+    
+    args = _build_parser().parse_args()
     
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
     
-    # Load environment variables from .env file
-    load_dotenv()
-    
-    # Get database URL from arguments or environment
-    db_url = args.db_url or os.environ.get('DATABASE_URL')
-    if not db_url:
-        logger.error("No database URL provided. Use --db-url or set DATABASE_URL environment variable.")
-        return 1
+    db_url = args.db_url
     
     try:
-        logger.info(f"Starting Songwriter Identification System")
+        logger.info("Starting Songwriter Identification System")
         
         # Set up database
         engine = setup_database(db_url)
@@ -104,13 +187,21 @@ def main():
             logger.error("Failed to set up database.")
             return 1
             
+        if not (args.catalog or args.daemon):
+            logger.info("No catalog provided and not running in daemon mode. Use --catalog or --daemon.")
+            logger.info("System initialized but exiting. Use --daemon to keep running.")
+            return 0
+            
         # Load configuration
         config = load_config(args.config)
         
-        # Initialize pipeline
+        from songwriter_id.pipeline import SongwriterIdentificationPipeline
+        
+        # Initialize pipeline with the already parsed configuration
         pipeline = SongwriterIdentificationPipeline(
             config_file=args.config,
-            db_connection=db_url
+            config_dict=config,
+            db_engine=engine
         )
         
         # If catalog provided, process it directly
@@ -119,44 +210,27 @@ def main():
                 catalog_path=args.catalog,
                 audio_base_path=args.audio_path
             )
-            logger.info(f"Catalog processing complete: {result}")
+            logger.info("Catalog processing complete: %s", result)
             return 0
             
-        # If daemon mode is requested, start the job scheduler
-        if args.daemon:
-            logger.info("Starting job scheduler daemon...")
-            
-            # Initialize and start the scheduler
-            scheduler = JobScheduler(pipeline, jobs_dir=args.jobs_dir)
-            scheduler.start()
-            
-            logger.info(f"Job scheduler started and monitoring {args.jobs_dir} for job files")
-            
-            # Loop forever, checking for new jobs
-            try:
-                while True:
-                    # List any active jobs for log monitoring
-                    jobs = scheduler.list_jobs()
-                    running_jobs = [j for j in jobs.values() if j.get('status') == 'running']
-                    
-                    if running_jobs:
-                        logger.info(f"Currently running {len(running_jobs)} jobs")
-                    
-                    # Sleep for a while
-                    time.sleep(60)
-            except KeyboardInterrupt:
-                logger.info("Received keyboard interrupt, shutting down...")
-                scheduler.stop()
-                
-            return 0
-            
-        else:
-            logger.info("No catalog provided and not running in daemon mode. Use --catalog or --daemon.")
-            logger.info("System initialized but exiting. Use --daemon to keep running.")
-            return 0
+        # Otherwise daemon mode was requested, so start the job scheduler
+        logger.info("Starting job scheduler daemon...")
+        
+        from songwriter_id.scheduler import JobScheduler
+        
+        # Initialize the scheduler, then start it and sleep until a shutdown
+        # signal arrives
+        scheduler = JobScheduler(pipeline, jobs_dir=args.jobs_dir)
+        logger.info("Starting job scheduler to monitor %s for job files", args.jobs_dir)
+        sig = _run_scheduler_until_signal(scheduler)
+        logger.info("Received signal %s, shutting down...", sig)
+        logger.info("Stopping job scheduler...")
+        scheduler.stop()
+        logger.info("Shutdown complete.")
+        return 0
             
     except Exception as e:
-        logger.error(f"Error in main application: {e}", exc_info=True)
+        logger.error("Error in main application: %s", e, exc_info=True)
         return 1
 
 
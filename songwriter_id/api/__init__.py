@@ -1,20 +1,28 @@
 """API integration package for the songwriter identification system."""
 
-from songwriter_id.api.musicbrainz import MusicBrainzClient
+import importlib
 
-# Import MusicBrainzDatabaseClient
-try:
-    from songwriter_id.api.musicbrainz_db import MusicBrainzDatabaseClient
-    __all__ = ['MusicBrainzClient', 'MusicBrainzDatabaseClient']
-except ImportError as e:
-    # SQLAlchemy may not be available or properly configured
-    import logging
-    logging.warning(f"MusicBrainzDatabaseClient not available: {e}")
-    __all__ = ['MusicBrainzClient']
+# Clients are imported on first access so that using one client does not
+# pull in the dependencies of the others (musicbrainzngs, SQLAlchemy,
+# acoustid/chromaprint). Accessing a client whose dependencies are missing
+# raises ImportError, as a direct import would.
+_LAZY_IMPORTS = {
+    'MusicBrainzClient': 'songwriter_id.api.musicbrainz',
+    'MusicBrainzDatabaseClient': 'songwriter_id.api.musicbrainz_db',
+    'AcoustIDClient': 'songwriter_id.api.acoustid',
+}
 
-# Import AcoustIDClient only if the chromaprint library is available
-try:
-    from songwriter_id.api.acoustid import AcoustIDClient
-    __all__ = ['MusicBrainzClient', 'MusicBrainzDatabaseClient', 'AcoustIDClient']
-except ImportError:
-    pass
+__all__ = ['MusicBrainzClient', 'MusicBrainzDatabaseClient', 'AcoustIDClient']
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_IMPORTS[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,43 +1,130 @@
 """AcoustID API integration for audio fingerprinting."""
 
 import logging
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import acoustid
 import chromaprint
+import requests
+
+# Use orjson for faster parsing of lookup responses if available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
+# AcoustID web service lookup endpoint
+ACOUSTID_LOOKUP_URL = "https://api.acoustid.org/v2/lookup"
+
+# Read size used when streaming audio files to fpcalc
+FPCALC_BUFFER_SIZE = 1 << 20
+
 
 class AcoustIDClient:
     """Client for interacting with the AcoustID API."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_session: Optional[requests.Session] = None,
+                 timeout: float = 10.0):
         """Initialize the AcoustID client.
 
         Args:
             api_key: AcoustID API key
+            http_session: Shared HTTP session for connection reuse (optional).
+                When not provided, lookups go through the acoustid library,
+                which opens a new connection per request.
+            timeout: Request timeout in seconds when using http_session (default: 10.0)
         """
         self.api_key = api_key
+        self.http_session = http_session
+        self.timeout = timeout
+        self._request_lock = threading.Lock()
+        self._last_request_time = 0.0
 
-    def generate_fingerprint(self, audio_file: str) -> Tuple[float, str]:
+    def generate_fingerprint(self, audio_file: str,
+                             buffer_size: int = FPCALC_BUFFER_SIZE) -> Tuple[float, str]:
         """Generate acoustic fingerprint from audio file.
 
+        The file is streamed to fpcalc in large sequential reads. If fpcalc is
+        unavailable or cannot decode the stream, the acoustid library's own
+        fingerprinting is used instead.
+
         Args:
             audio_file: Path to the audio file
+            buffer_size: Read size in bytes when streaming to fpcalc (default: 1 MiB)
 
         Returns:
             Tuple of (duration, fingerprint)
         """
         try:
-            duration, fp_encoded = acoustid.fingerprint_file(audio_file)
+            try:
+                duration, fp_encoded = self._fingerprint_fpcalc(audio_file, buffer_size)
+            except (acoustid.NoBackendError, acoustid.FingerprintGenerationError) as e:
+                logger.debug("Streaming fpcalc failed for %s, falling back: %s", audio_file, e)
+                duration, fp_encoded = acoustid.fingerprint_file(audio_file)
             fingerprint = chromaprint.decode_fingerprint(fp_encoded)[0]
             return duration, fingerprint
         except Exception as e:
-            logger.error(f"Error generating fingerprint: {e}")
+            logger.error("Error generating fingerprint: %s", e)
             raise
 
+    def _fingerprint_fpcalc(self, audio_file: str, buffer_size: int) -> Tuple[float, bytes]:
+        """Fingerprint an audio file by piping it to fpcalc through stdin.
+
+        Args:
+            audio_file: Path to the audio file
+            buffer_size: Read size in bytes
+
+        Returns:
+            Tuple of (duration, encoded fingerprint)
+        """
+        fpcalc = os.environ.get(acoustid.FPCALC_ENVVAR, acoustid.FPCALC_COMMAND)
+        command = [fpcalc, "-length", str(acoustid.MAX_AUDIO_LENGTH), "-"]
+        try:
+            proc = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            raise acoustid.NoBackendError(f"fpcalc invocation failed: {e}")
+
+        try:
+            with open(audio_file, 'rb', buffering=buffer_size) as f:
+                for chunk in iter(lambda: f.read(buffer_size), b''):
+                    proc.stdin.write(chunk)
+        except BrokenPipeError:
+            # fpcalc stops reading once it has enough audio
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            output = proc.stdout.read()
+            proc.stdout.close()
+            retcode = proc.wait()
+
+        if retcode:
+            raise acoustid.FingerprintGenerationError(f"fpcalc exited with status {retcode}")
+
+        duration = fp_encoded = None
+        for line in output.splitlines():
+            key, _, value = line.partition(b"=")
+            if key == b"DURATION":
+                duration = float(value)
+            elif key == b"FINGERPRINT":
+                fp_encoded = value
+
+        if duration is None or fp_encoded is None:
+            raise acoustid.FingerprintGenerationError("missing fpcalc output")
+        return duration, fp_encoded
+
     def lookup_recording(self, duration: float, fingerprint: str) -> List[Dict]:
         """Look up recording by fingerprint.
 
@@ -49,12 +136,50 @@ class AcoustIDClient:
             List of matching recordings with metadata
         """
         try:
-            results = acoustid.lookup(self.api_key, fingerprint, duration, meta="recordings")
+            if self.http_session is None:
+                results = acoustid.lookup(self.api_key, fingerprint, duration, meta="recordings")
+            else:
+                results = self._session_lookup(duration, fingerprint, meta="recordings")
             return results.get("results", [])
         except Exception as e:
-            logger.error(f"AcoustID lookup error: {e}")
+            logger.error("AcoustID lookup error: %s", e)
             return []
 
+    def _session_lookup(self, duration: float, fingerprint: str, meta: str) -> Dict:
+        """Look up a fingerprint through the shared HTTP session.
+
+        Applies the same request interval as the acoustid library.
+
+        Args:
+            duration: Audio duration in seconds
+            fingerprint: Chromaprint fingerprint
+            meta: Metadata to include in the response
+
+        Returns:
+            Parsed JSON response
+        """
+        with self._request_lock:
+            wait = acoustid.REQUEST_INTERVAL - (time.time() - self._last_request_time)
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request_time = time.time()
+
+        response = self.http_session.post(
+            ACOUSTID_LOOKUP_URL,
+            data={
+                "format": "json",
+                "client": self.api_key,
+                "duration": int(duration),
+                "fingerprint": fingerprint,
+                "meta": meta
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        if HAS_ORJSON:
+            return orjson.loads(response.content)
+        return response.json()
+
     def identify_track(self, audio_file: str) -> List[Dict]:
         """Identify track using audio fingerprinting.
 
@@ -88,5 +213,25 @@ class AcoustIDClient:
             
             return results
         except Exception as e:
-            logger.error(f"Track identification error: {e}")
+            logger.error("Track identification error: %s", e)
             return []
+
+    def identify_tracks(self, audio_files: List[str],
+                        max_workers: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """Identify several tracks concurrently.
+
+        Fingerprinting runs in separate fpcalc processes, so worker threads
+        overlap it with lookups for other files. Lookups remain limited to the
+        AcoustID request rate.
+
+        Args:
+            audio_files: Paths to the audio files
+            max_workers: Number of files processed at once (default: CPU count)
+
+        Returns:
+            Dictionary mapping each audio file to its list of potential matches
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.identify_track, audio_files)
+            return dict(zip(audio_files, results))
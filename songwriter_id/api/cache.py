@@ -0,0 +1,106 @@
+"""Persistent on-disk cache for external API responses."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default number of seconds a cached response stays valid (30 days)
+DEFAULT_TTL = 30 * 24 * 60 * 60
+
+# Default maximum number of cached responses before the least recently used are evicted
+DEFAULT_MAX_ENTRIES = 1000000
+
+# Number of writes between checks of the cache size
+EVICTION_INTERVAL = 1000
+
+
+class ResponseCache:
+    """SQLite-backed cache of JSON-serializable API responses.
+
+    Entries survive process restarts, expire after a TTL and are evicted in
+    least-recently-used order once the cache holds more than max_entries.
+    Responses are stored as JSON rather than pickles, so a tampered cache file
+    cannot execute code. The cache is safe to share between threads.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open or create the cache.
+
+        Args:
+            path: Path of the SQLite cache file
+            ttl: Seconds a cached response stays valid (default: 30 days)
+            max_entries: Maximum number of cached responses (default: 1000000)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL lets other processes read the cache while this one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache a response.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable response
+        """
+        now = time.time()
+        data = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, data, now + self.ttl, now))
+            # Counting rows scans the table, so only check the size periodically
+            self._writes += 1
+            if self._writes % EVICTION_INTERVAL:
+                return
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute("""
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY accessed_at LIMIT ?
+                    )
+                """, (count - self.max_entries,))
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            self._conn.close()
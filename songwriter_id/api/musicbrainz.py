@@ -1,29 +1,152 @@
 """MusicBrainz API integration for songwriter identification."""
 
+import functools
+import io
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, Union
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 import musicbrainzngs
-from urllib.error import HTTPError
-from requests.exceptions import RequestException
+import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.retry import Retry
+
+from songwriter_id.api.cache import DEFAULT_TTL as PERSISTENT_CACHE_TTL, ResponseCache
+
+# Use RapidFuzz for typo-tolerant match scoring if available
+try:
+    from rapidfuzz import fuzz
+    from rapidfuzz import utils as fuzz_utils
+    from rapidfuzz.distance import Levenshtein
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+if TYPE_CHECKING:
+    from songwriter_id.api.musicbrainz_db import MusicBrainzDatabaseClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of recording and work lookups memoized per client
+LOOKUP_CACHE_SIZE = 100000
+# Seconds a memoized lookup stays valid, so edits on MusicBrainz are picked up
+LOOKUP_CACHE_TTL = 24 * 60 * 60
+
+# MusicBrainz web service root
+MUSICBRAINZ_WS_URL = "https://musicbrainz.org/ws/2"
+
+# Upper bound in seconds for a single retry delay
+MAX_BACKOFF = 60.0
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+
+class _RateLimitedRetry(Retry):
+    """Retry policy that waits at least min_backoff seconds before any retry.
+
+    urllib3 retries the first failure without waiting, which would resend a
+    throttled request (503) immediately, bypassing the client's rate limit.
+    """
+
+    def __init__(self, *args, min_backoff: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_backoff = min_backoff
+
+    def new(self, **kw) -> "_RateLimitedRetry":
+        kw.setdefault("min_backoff", self.min_backoff)
+        return super().new(**kw)
+
+    def get_backoff_time(self) -> float:
+        return max(self.min_backoff, super().get_backoff_time())
+
+
+# Characters per allowed edit for a full fuzzy match, and the similarity
+# (0-100) needed for a partial one
+FULL_MATCH_CHARS_PER_EDIT = 8
+PARTIAL_MATCH_THRESHOLD = 80
+
+# Translation table escaping Lucene special characters in search terms
+_LUCENE_ESCAPE = str.maketrans({c: "\\" + c for c in '+-&|!(){}[]^"~*?:\\/'})
+
+
+def _normalize_term(term: str) -> str:
+    """Normalize a string for _match_level.
+
+    With RapidFuzz installed, case, punctuation and whitespace are normalized;
+    otherwise the string is only lowercased.
+    """
+    if HAS_RAPIDFUZZ:
+        return fuzz_utils.default_process(term)
+    return term.lower()
+
+
+def _match_level(query: str, candidate: str) -> int:
+    """Classify how closely a candidate string matches a search term.
+
+    The search term is normalized by the caller, once per search, and the
+    candidate here. With RapidFuzz installed, the strings are compared by
+    edit-distance similarity, so near-matches with typos still count. A full match allows one edit per
+    FULL_MATCH_CHARS_PER_EDIT characters; the length check and the distance
+    cutoff reject clear mismatches without computing the full distance.
+    Otherwise exact and substring comparisons are used.
+
+    Args:
+        query: Search term, normalized with _normalize_term
+        candidate: String from a MusicBrainz result
+
+    Returns:
+        2 for a full match, 1 for a partial match, 0 for no match
+    """
+    candidate = _normalize_term(candidate)
+    if HAS_RAPIDFUZZ:
+        if not query or not candidate:
+            return 0
+        # Exact matches are common and need no distance computation
+        if candidate == query:
+            return 2
+        max_distance = max(len(query), len(candidate)) // FULL_MATCH_CHARS_PER_EDIT
+        if (abs(len(query) - len(candidate)) <= max_distance and
+                Levenshtein.distance(query, candidate, score_cutoff=max_distance) <= max_distance):
+            return 2
+        if fuzz.WRatio(query, candidate) >= PARTIAL_MATCH_THRESHOLD:
+            return 1
+        return 0
+
+    if candidate == query:
+        return 2
+    if query in candidate or candidate in query:
+        return 1
+    return 0
+
 
 class MusicBrainzClient:
     """Client for interacting with the MusicBrainz API."""
 
     # Define role mappings
-    COMPOSER_ROLES = ["composer", "writer", "songwriter"]
-    LYRICIST_ROLES = ["lyricist"]
-    ARRANGER_ROLES = ["arranger"]
-    PRODUCER_ROLES = ["producer"]
+    COMPOSER_ROLES = frozenset({"composer", "writer", "songwriter"})
+    LYRICIST_ROLES = frozenset({"lyricist"})
+    ARRANGER_ROLES = frozenset({"arranger"})
+    PRODUCER_ROLES = frozenset({"producer"})
+    # Standardized role for each writing relationship type; only these count
+    # when falling back to recording relationships
+    _WRITING_ROLE_MAP = {**{role: "composer" for role in COMPOSER_ROLES},
+                         **{role: "lyricist" for role in LYRICIST_ROLES},
+                         **{role: "arranger" for role in ARRANGER_ROLES}}
+    # Standardized role for each relationship type
+    ROLE_MAP = {**_WRITING_ROLE_MAP, **{role: "producer" for role in PRODUCER_ROLES}}
     
     # Define publisher types
-    PUBLISHER_TYPES = ["publisher", "publishing company"]
+    PUBLISHER_TYPES = frozenset({"publisher", "publishing company"})
 
-    def __init__(self, app_name: str, version: str, contact: str, rate_limit: float = 1.0, retries: int = 3):
+    def __init__(self, app_name: str, version: str, contact: str, rate_limit: float = 1.0, retries: int = 3,
+                 http_session: Optional[requests.Session] = None, timeout: float = 10.0,
+                 db_client: Optional["MusicBrainzDatabaseClient"] = None,
+                 cache_path: Optional[str] = None, cache_ttl: float = PERSISTENT_CACHE_TTL):
         """Initialize the MusicBrainz client.
 
         Args:
@@ -31,19 +154,67 @@ class MusicBrainzClient:
             version: Application version
             contact: Contact email
             rate_limit: Time between requests in seconds (default: 1.0)
-            retries: Number of retries for failed requests (default: 3)
+            retries: Number of retries for failed requests made through
+                http_session (default: 3)
+            http_session: Shared HTTP session for connection reuse (optional).
+                When not provided, requests go through musicbrainzngs,
+                which opens a new connection per request and applies its
+                own retry policy.
+            timeout: Request timeout in seconds when using http_session (default: 10.0)
+            db_client: Local MusicBrainz database client (optional). When provided,
+                lookups are served from the database first and only go to the
+                web service when the database returns nothing.
+            cache_path: Path of a SQLite file caching web service responses
+                across runs (optional)
+            cache_ttl: Seconds a response stays in the persistent cache
+                (default: 30 days)
         """
         self.app_name = app_name
         self.rate_limit = rate_limit
         self.retries = retries
         self.last_request_time = 0
+        self._request_lock = threading.Lock()
+        self.http_session = http_session
+        self.timeout = timeout
+        self.db_client = db_client
+        self.response_cache = ResponseCache(cache_path, ttl=cache_ttl) if cache_path else None
+        self.user_agent = f"{app_name}/{version} ( {contact} )"
+        
+        if http_session is not None:
+            # Retry MusicBrainz requests with jittered exponential backoff,
+            # honouring Retry-After and waiting at least rate_limit seconds so
+            # retries stay within the rate limit; other users of the session
+            # are unaffected. The session's pool sizes carry over.
+            current = http_session.get_adapter(MUSICBRAINZ_WS_URL)
+            http_session.mount(MUSICBRAINZ_WS_URL, HTTPAdapter(
+                pool_connections=getattr(current, "_pool_connections", DEFAULT_POOLSIZE),
+                pool_maxsize=getattr(current, "_pool_maxsize", DEFAULT_POOLSIZE),
+                pool_block=getattr(current, "_pool_block", DEFAULT_POOLBLOCK),
+                max_retries=_RateLimitedRetry(
+                    total=retries,
+                    backoff_factor=rate_limit,
+                    backoff_jitter=rate_limit,
+                    backoff_max=MAX_BACKOFF,
+                    min_backoff=rate_limit,
+                    status_forcelist=RETRY_STATUS_CODES,
+                    allowed_methods=["GET"],
+                    respect_retry_after_header=True
+                )
+            ))
         
         # Set up MusicBrainz API
         musicbrainzngs.set_useragent(app_name, version, contact)
         musicbrainzngs.set_rate_limit(rate_limit)
+        
+        # Memoize lookups by ID, since catalogs often share recordings and works
+        self._cached_lookup = functools.lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._fetch_lookup)
 
     def _rate_limited_request(self, func, *args, **kwargs):
-        """Execute a rate-limited request with retries.
+        """Execute a rate-limited request.
+        
+        Retries are left to the transport: musicbrainzngs retries transient
+        errors itself, and requests through the shared HTTP session use the
+        urllib3 retry policy mounted for the MusicBrainz web service.
         
         Args:
             func: Function to call
@@ -52,40 +223,61 @@ class MusicBrainzClient:
             
         Returns:
             Result of the function call
-            
-        Raises:
-            Exception: If all retries fail
         """
-        # Enforce rate limiting
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last)
+        # Enforce rate limiting across threads; only the wait is serialized,
+        # so requests from different threads can overlap on the network
+        with self._request_lock:
+            time_since_last = time.time() - self.last_request_time
+            if time_since_last < self.rate_limit:
+                time.sleep(self.rate_limit - time_since_last)
+            self.last_request_time = time.time()
         
-        # Try the request with retries
-        for attempt in range(self.retries):
-            try:
-                self.last_request_time = time.time()
-                return func(*args, **kwargs)
-            except (HTTPError, RequestException) as e:
-                logger.warning(f"MusicBrainz request failed (attempt {attempt+1}/{self.retries}): {e}")
-                
-                # Check if we should retry based on error code
-                if isinstance(e, HTTPError) and e.code in [429, 503, 504]:
-                    # Rate limiting or server error - wait longer and retry
-                    retry_delay = self.rate_limit * (2 ** attempt)
-                    logger.info(f"Rate limited or server error, waiting {retry_delay:.2f}s before retry")
-                    time.sleep(retry_delay)
-                    continue
-                elif attempt < self.retries - 1:
-                    # Other error but not last attempt - retry after delay
-                    time.sleep(self.rate_limit)
-                    continue
-                else:
-                    raise
-        
-        # Should never reach here due to the raise in the loop
-        raise Exception("All retry attempts failed")
+        return func(*args, **kwargs)
+
+    def _ws_request(self, entity: str, mbid: str = "", includes: Optional[List[str]] = None,
+                    **params) -> Dict:
+        """Query the MusicBrainz web service through the shared HTTP session.
+
+        The XML response is parsed with musicbrainzngs, so results have the
+        same shape as the musicbrainzngs functions return.
+
+        Args:
+            entity: Entity type, e.g. "recording" or "work"
+            mbid: MusicBrainz ID, or empty for a search
+            includes: Relationship and sub-query includes
+            **params: Additional query parameters
+
+        Returns:
+            Parsed MusicBrainz response
+        """
+        if includes:
+            params["inc"] = " ".join(includes)
+        response = self.http_session.get(
+            f"{MUSICBRAINZ_WS_URL}/{entity}/{mbid}",
+            params=params,
+            headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return musicbrainzngs.mbxml.parse_message(io.BytesIO(response.content))
+
+    def _search_recordings(self, query: str, limit: int) -> Dict:
+        """Search recordings through the shared session or musicbrainzngs."""
+        if self.http_session is None:
+            return musicbrainzngs.search_recordings(query=query, limit=limit)
+        return self._ws_request("recording", query=query, limit=limit)
+
+    def _get_recording(self, recording_id: str, includes: List[str]) -> Dict:
+        """Get a recording through the shared session or musicbrainzngs."""
+        if self.http_session is None:
+            return musicbrainzngs.get_recording_by_id(recording_id, includes=includes)
+        return self._ws_request("recording", recording_id, includes)
+
+    def _get_work(self, work_id: str, includes: List[str]) -> Dict:
+        """Get a work through the shared session or musicbrainzngs."""
+        if self.http_session is None:
+            return musicbrainzngs.get_work_by_id(work_id, includes=includes)
+        return self._ws_request("work", work_id, includes)
 
     def search_recording(self, title: str, artist: str, limit: int = 10) -> List[Dict]:
         """Search for recordings matching the title and artist.
@@ -98,16 +290,22 @@ class MusicBrainzClient:
         Returns:
             List of matching recordings
         """
+        if self.db_client is not None:
+            recordings = self.db_client.search_recording(title, artist, limit)
+            if recordings:
+                return recordings
+        
         try:
-            query = f"recording:\"{title}\" AND artist:\"{artist}\""
+            query = (f'recording:"{title.translate(_LUCENE_ESCAPE)}" '
+                     f'AND artist:"{artist.translate(_LUCENE_ESCAPE)}"')
             result = self._rate_limited_request(
-                musicbrainzngs.search_recordings,
+                self._search_recordings,
                 query=query,
                 limit=limit
             )
             return result.get("recording-list", [])
         except Exception as e:
-            logger.error(f"MusicBrainz search_recording error: {e}")
+            logger.error("MusicBrainz search_recording error: %s", e)
             return []
 
     def search_recording_advanced(self, title: str, artist: str, release: Optional[str] = None, 
@@ -123,16 +321,23 @@ class MusicBrainzClient:
         Returns:
             List of matching recordings
         """
+        if self.db_client is not None:
+            recordings = self.db_client.search_recording_advanced(title, artist, release, limit)
+            if recordings:
+                return recordings
+        
         try:
             # Build query with available parameters
-            query_parts = [f'recording:"{title}"', f'artist:"{artist}"']
+            query_parts = [f'recording:"{title.translate(_LUCENE_ESCAPE)}"',
+                           f'artist:"{artist.translate(_LUCENE_ESCAPE)}"']
             if release:
-                query_parts.append(f'release:"{release}"')
+                query_parts.append(f'release:"{release.translate(_LUCENE_ESCAPE)}"')
             
             query = " AND ".join(query_parts)
             
-            result = self._rate_limited_request(
-                musicbrainzngs.search_recordings,
+            result = self._cached_request(
+                f"search:{limit}:{query}",
+                self._search_recordings,
                 query=query,
                 limit=limit
             )
@@ -140,10 +345,15 @@ class MusicBrainzClient:
             recordings = result.get("recording-list", [])
             
             # Enrich recordings with confidence scores
+            # Normalize the search terms once for all candidates
+            title_norm = _normalize_term(title)
+            artist_norm = _normalize_term(artist)
+            release_norm = _normalize_term(release) if release else None
+            
             scored_recordings = []
             for rec in recordings:
                 # Calculate score based on similarity to search terms
-                score = self._calculate_match_score(rec, title, artist, release)
+                score = self._calculate_match_score(rec, title_norm, artist_norm, release_norm)
                 rec['score'] = score
                 scored_recordings.append(rec)
             
@@ -151,7 +361,7 @@ class MusicBrainzClient:
             return sorted(scored_recordings, key=lambda x: x.get('score', 0), reverse=True)
             
         except Exception as e:
-            logger.error(f"MusicBrainz search_recording_advanced error: {e}")
+            logger.error("MusicBrainz search_recording_advanced error: %s", e)
             return []
     
     def _calculate_match_score(self, recording: Dict, title: str, artist: str, 
@@ -160,9 +370,9 @@ class MusicBrainzClient:
         
         Args:
             recording: Recording data from MusicBrainz
-            title: Search title
-            artist: Search artist
-            release: Search release/album title (optional)
+            title: Search title, normalized with _normalize_term
+            artist: Search artist, normalized with _normalize_term
+            release: Search release/album title, normalized with _normalize_term (optional)
             
         Returns:
             Confidence score between 0.0 and 1.0
@@ -173,34 +383,22 @@ class MusicBrainzClient:
         release_score = 0.0
         
         # Title match (max 0.5)
-        rec_title = recording.get('title', '').lower()
-        title_lower = title.lower()
-        
-        if rec_title == title_lower:
-            title_score = 0.5
-        elif title_lower in rec_title or rec_title in title_lower:
-            title_score = 0.3
+        rec_title = recording.get('title', '')
+        title_score = (0.0, 0.3, 0.5)[_match_level(title, rec_title)]
         
         # Artist match (max 0.3)
-        rec_artist = recording.get('artist-credit', [{}])[0].get('artist', {}).get('name', '').lower()
-        artist_lower = artist.lower()
+        artist_credit = recording.get('artist-credit')
+        rec_artist = artist_credit[0].get('artist', {}).get('name', '') if artist_credit else ''
+        artist_score = (0.0, 0.2, 0.3)[_match_level(artist, rec_artist)]
         
-        if rec_artist == artist_lower:
-            artist_score = 0.3
-        elif artist_lower in rec_artist or rec_artist in artist_lower:
-            artist_score = 0.2
-        
-        # Release match (max 0.2)
+        # Release match (max 0.2), using the best matching release
         if release and 'release-list' in recording:
-            release_lower = release.lower()
+            best_level = 0
             for rel in recording.get('release-list', []):
-                rel_title = rel.get('title', '').lower()
-                if rel_title == release_lower:
-                    release_score = 0.2
-                    break
-                elif release_lower in rel_title or rel_title in release_lower:
-                    release_score = 0.1
+                best_level = max(best_level, _match_level(release, rel.get('title', '')))
+                if best_level == 2:
                     break
+            release_score = (0.0, 0.1, 0.2)[best_level]
         elif not release:
             # No release to match against - give a neutral score
             release_score = 0.1
@@ -217,16 +415,18 @@ class MusicBrainzClient:
         Returns:
             Recording information or None
         """
+        if self.db_client is not None:
+            recording = self.db_client.get_recording_by_id(recording_id)
+            if recording:
+                return recording
+        
         try:
-            result = self._rate_limited_request(
-                musicbrainzngs.get_recording_by_id,
-                recording_id,
-                includes=["artists", "releases", "work-rels", "artist-rels"]
-            )
+            result = self._lookup(
+                "recording", recording_id, ("artists", "releases", "work-rels", "artist-rels"))
             
             return result.get("recording")
         except Exception as e:
-            logger.error(f"MusicBrainz get_recording_by_id error: {e}")
+            logger.error("MusicBrainz get_recording_by_id error: %s", e)
             return None
     
     def get_work_by_id(self, work_id: str) -> Optional[Dict]:
@@ -238,18 +438,95 @@ class MusicBrainzClient:
         Returns:
             Work information or None
         """
+        if self.db_client is not None:
+            work = self.db_client.get_work_by_id(work_id)
+            if work:
+                return work
+        
         try:
-            result = self._rate_limited_request(
-                musicbrainzngs.get_work_by_id,
-                work_id,
-                includes=["artist-rels", "label-rels"]
-            )
+            result = self._lookup("work", work_id, ("artist-rels", "label-rels"))
             
             return result.get("work")
         except Exception as e:
-            logger.error(f"MusicBrainz get_work_by_id error: {e}")
+            logger.error("MusicBrainz get_work_by_id error: %s", e)
             return None
 
+    def _lookup(self, entity: str, mbid: str, includes: Tuple[str, ...]) -> Dict:
+        """Look up a recording or work by ID, memoized for up to LOOKUP_CACHE_TTL seconds.
+
+        Failed requests raise and are therefore never cached.
+
+        Args:
+            entity: "recording" or "work"
+            mbid: MusicBrainz ID
+            includes: Relationship and sub-query includes
+
+        Returns:
+            Raw MusicBrainz response
+        """
+        # The TTL period number is part of the cache key, so entries from an
+        # earlier period are never returned
+        return self._cached_lookup(entity, mbid, includes, int(time.time() // LOOKUP_CACHE_TTL))
+
+    def _fetch_lookup(self, entity: str, mbid: str, includes: Tuple[str, ...],
+                      ttl_period: int) -> Dict:
+        """Fetch a recording or work from MusicBrainz; see _lookup."""
+        return self._cached_request(
+            f"{entity}:{mbid}:{','.join(includes)}",
+            self._get_recording if entity == "recording" else self._get_work,
+            mbid, includes=list(includes))
+
+    def _cached_request(self, key: str, func, *args, **kwargs) -> Dict:
+        """Make a rate-limited request through the persistent cache, if configured.
+
+        Args:
+            key: Persistent cache key identifying the request
+            func: Request function, as for _rate_limited_request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Raw MusicBrainz response
+        """
+        if self.response_cache is not None:
+            result = self.response_cache.get(key)
+            if result is not None:
+                return result
+        result = self._rate_limited_request(func, *args, **kwargs)
+        if self.response_cache is not None:
+            self.response_cache.set(key, result)
+        return result
+
+    def _get_recording_relations(self, recording_id: str) -> Dict:
+        """Fetch a recording with its works and their relationships in one request.
+
+        work-level-rels embeds the artist and label relationships of each
+        linked work, so the works do not need to be fetched separately.
+        Artist relationships of the recording itself are needed too, because
+        get_work_credits falls back to them when the works carry no credits.
+
+        Args:
+            recording_id: MusicBrainz recording ID
+
+        Returns:
+            Raw MusicBrainz response
+        """
+        return self._lookup(
+            "recording", recording_id, ("work-rels", "work-level-rels", "artist-rels", "label-rels"))
+
+    def _get_work_relations(self, work_id: str) -> Dict:
+        """Fetch a work with its artist and label relationships.
+
+        Label relationships provide the publisher credits.
+
+        Args:
+            work_id: MusicBrainz work ID
+
+        Returns:
+            Raw MusicBrainz response
+        """
+        return self._lookup("work", work_id, ("artist-rels", "label-rels"))
+
     def get_work_credits(self, recording_id: str) -> List[Dict]:
         """Get songwriter credits for a work linked to a recording.
 
@@ -259,13 +536,14 @@ class MusicBrainzClient:
         Returns:
             List of songwriter credits
         """
+        if self.db_client is not None:
+            credits = self.db_client.get_work_credits(recording_id)
+            if credits:
+                return credits
+        
         try:
             # Get recording with work relationships
-            recording = self._rate_limited_request(
-                musicbrainzngs.get_recording_by_id,
-                recording_id, 
-                includes=["work-rels", "artist-rels"]
-            )
+            recording = self._get_recording_relations(recording_id)
             
             if "recording" not in recording:
                 return []
@@ -273,6 +551,11 @@ class MusicBrainzClient:
             recording_data = recording["recording"]
             credits = []
             
+            # Bind the lookup tables to locals for the loops below
+            role_map = self.ROLE_MAP
+            writing_role_map = self._WRITING_ROLE_MAP
+            publisher_types = self.PUBLISHER_TYPES
+            
             # Extract works
             if "work-relation-list" in recording_data:
                 for work_rel in recording_data["work-relation-list"]:
@@ -280,12 +563,12 @@ class MusicBrainzClient:
                         work_id = work_rel["work"]["id"]
                         work_title = work_rel["work"].get("title", "")
                         
-                        # Get work details with relationship information
-                        work = self._rate_limited_request(
-                            musicbrainzngs.get_work_by_id,
-                            work_id, 
-                            includes=["artist-rels", "label-rels"]
-                        )
+                        # Use the work relationships embedded in the recording and
+                        # only fetch works that came back without any
+                        work = work_rel
+                        if not any(key in work_rel["work"]
+                                   for key in ("artist-relation-list", "label-relation-list")):
+                            work = self._get_work_relations(work_id)
                         
                         if "work" in work:
                             work_data = work["work"]
@@ -294,17 +577,7 @@ class MusicBrainzClient:
                                 for artist_rel in work_data["artist-relation-list"]:
                                     role = artist_rel.get("type", "").lower()
                                     
-                                    # Determine standardized role
-                                    if role in self.COMPOSER_ROLES:
-                                        standardized_role = "composer"
-                                    elif role in self.LYRICIST_ROLES:
-                                        standardized_role = "lyricist"
-                                    elif role in self.ARRANGER_ROLES:
-                                        standardized_role = "arranger"
-                                    elif role in self.PRODUCER_ROLES:
-                                        standardized_role = "producer"
-                                    else:
-                                        standardized_role = role
+                                    standardized_role = role_map.get(role, role)
                                     
                                     credits.append({
                                         "name": artist_rel["artist"]["name"],
@@ -320,7 +593,7 @@ class MusicBrainzClient:
                             if "label-relation-list" in work_data:
                                 for label_rel in work_data["label-relation-list"]:
                                     rel_type = label_rel.get("type", "").lower()
-                                    if rel_type in self.PUBLISHER_TYPES:
+                                    if rel_type in publisher_types:
                                         credits.append({
                                             "name": label_rel["label"]["name"],
                                             "role": "publisher",
@@ -336,16 +609,8 @@ class MusicBrainzClient:
                 for artist_rel in recording_data["artist-relation-list"]:
                     role = artist_rel.get("type", "").lower()
                     
-                    if role in self.COMPOSER_ROLES + self.LYRICIST_ROLES + self.ARRANGER_ROLES:
-                        # Determine standardized role
-                        if role in self.COMPOSER_ROLES:
-                            standardized_role = "composer"
-                        elif role in self.LYRICIST_ROLES:
-                            standardized_role = "lyricist"
-                        elif role in self.ARRANGER_ROLES:
-                            standardized_role = "arranger"
-                        else:
-                            standardized_role = role
+                    standardized_role = writing_role_map.get(role)
+                    if standardized_role:
                         
                         credits.append({
                             "name": artist_rel["artist"]["name"],
@@ -358,12 +623,15 @@ class MusicBrainzClient:
             
             return credits
         except Exception as e:
-            logger.error(f"MusicBrainz get_work_credits error: {e}")
+            logger.error("MusicBrainz get_work_credits error: %s", e)
             return []
     
     def get_credits_by_title_artist(self, title: str, artist: str, release: Optional[str] = None) -> List[Dict]:
         """Get songwriter credits by searching for title and artist.
         
+        With a database client, its credits are returned and the web service
+        is only searched when the database has none.
+        
         Args:
             title: Track title
             artist: Artist name
@@ -372,30 +640,48 @@ class MusicBrainzClient:
         Returns:
             List of songwriter credits
         """
-        all_credits = []
+        if self.db_client is not None:
+            credits = self.db_client.get_credits_by_title_artist(title, artist, release)
+            if credits:
+                return credits
         
         # Search for recordings
         recordings = self.search_recording_advanced(title, artist, release)
         
         if not recordings:
-            logger.info(f"No recordings found for '{title}' by '{artist}'")
+            logger.info("No recordings found for '%s' by '%s'", title, artist)
             return []
         
-        # Process top 3 recording matches (or fewer if less available)
-        for i, recording in enumerate(recordings[:3]):
-            recording_id = recording.get("id")
-            if not recording_id:
-                continue
-                
-            # Get credits for this recording
-            credits = self.get_work_credits(recording_id)
+        # Fetch credits for the top 3 recording matches (or fewer if less
+        # available) concurrently; the shared rate limiter spaces the requests.
+        # Responses only overlap through http_session, since musicbrainzngs
+        # holds a global lock for the whole of each request.
+        top_recordings = [(i, rec) for i, rec in enumerate(recordings[:3]) if rec.get("id")]
+        with ThreadPoolExecutor(max_workers=len(top_recordings) or 1) as executor:
+            credit_lists = list(executor.map(
+                self.get_work_credits, [rec["id"] for _, rec in top_recordings]))
+        
+        # Deduplicate (same person in same role) while collecting, keeping
+        # the credit with the highest confidence
+        unique_credits = {}
+        for (i, recording), credits in zip(top_recordings, credit_lists):
+            recording_id = recording["id"]
             
             # Adjust confidence based on recording match position
             position_factor = 1.0 if i == 0 else (0.9 if i == 1 else 0.8)
+            # Scale the confidence by position factor and recording score
+            confidence_factor = position_factor * recording.get("score", 0.5)
             for credit in credits:
-                # Scale the confidence by position factor and recording score
-                recording_score = recording.get("score", 0.5)
-                credit["confidence_score"] = credit["confidence_score"] * position_factor * recording_score
+                key = (credit["name"], credit["role"])
+                confidence_score = credit["confidence_score"] * confidence_factor
+                previous = unique_credits.get(key)
+                if previous is not None and confidence_score <= previous["confidence_score"]:
+                    continue
+                
+                # Callers may cache get_work_credits results, so copy the
+                # credit before adding the match details
+                credit = dict(credit)
+                credit["confidence_score"] = confidence_score
                 credit["recording_id"] = recording_id
                 credit["recording_title"] = recording.get("title")
                 
@@ -404,15 +690,51 @@ class MusicBrainzClient:
                 credit["search_artist"] = artist
                 if release:
                     credit["search_release"] = release
-            
-            all_credits.extend(credits)
-        
-        # Remove duplicates (same person in same role)
-        unique_credits = {}
-        for credit in all_credits:
-            key = f"{credit['name']}_{credit['role']}"
-            # Keep the one with highest confidence
-            if key not in unique_credits or credit["confidence_score"] > unique_credits[key]["confidence_score"]:
                 unique_credits[key] = credit
         
         return list(unique_credits.values())
+
+    def get_credits_batch(self, tracks: List[Tuple[str, str, Optional[str]]],
+                          max_workers: int = 4) -> List[List[Dict]]:
+        """Get songwriter credits for several tracks concurrently.
+        
+        Tracks whose title, artist and release are equal after Unicode and case
+        normalization are looked up once. With a database client, all tracks
+        are first looked up in one database batch, and only tracks it has no
+        credits for are searched on the web service. Recordings and works
+        shared between tracks, such as those on one album, are fetched once
+        through the lookup cache.
+        
+        Args:
+            tracks: (title, artist, release) tuples; release may be None
+            max_workers: Number of lookups run at once (default: 4)
+            
+        Returns:
+            List of songwriter credits for each track, in input order
+        """
+        unique_tracks = {}
+        keys = []
+        for title, artist, release in tracks:
+            key = tuple(self._normalize_query_term(term) for term in (title, artist, release))
+            unique_tracks.setdefault(key, (title, artist, release))
+            keys.append(key)
+        
+        results = {}
+        if self.db_client is not None:
+            # The database client caches empty results too, so the misses are
+            # not queried again when they fall back to the web service below
+            db_results = self.db_client.get_credits_batch(list(unique_tracks.values()))
+            results = {key: credits for key, credits in zip(unique_tracks, db_results) if credits}
+        
+        missing = [key for key in unique_tracks if key not in results]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results.update(zip(missing, executor.map(
+                lambda key: self.get_credits_by_title_artist(*unique_tracks[key]), missing)))
+        
+        # Give every track its own credit dicts, since callers may modify them
+        return [[dict(credit) for credit in results[key]] for key in keys]
+    
+    @staticmethod
+    def _normalize_query_term(term: Optional[str]) -> str:
+        """Normalize a search term for detecting duplicate queries."""
+        return unicodedata.normalize("NFKD", term or "").casefold().strip()
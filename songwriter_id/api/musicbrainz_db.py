@@ -1,34 +1,338 @@
 """MusicBrainz database integration for songwriter identification."""
 
+import functools
 import logging
-from typing import Dict, List, Optional
-
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import QueuePool
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of recording and work lookups memoized per client
+LOOKUP_CACHE_SIZE = 50000
+# Seconds a memoized lookup stays valid
+LOOKUP_CACHE_TTL = 60 * 60
+# Maximum number of (title, artist, release) searches whose credits are cached
+CREDITS_CACHE_SIZE = 100000
+# Rows fetched from the server at a time by queries that can return many rows
+RESULT_BATCH_SIZE = 512
+
+# Whether the pg_trgm extension is installed
+_SQL_TRIGRAM_AVAILABLE = text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+
+# Artist credit of recording r, built in the API client's format
+_ARTIST_CREDIT_JSON = """(SELECT json_agg(json_strip_nulls(json_build_object(
+                    'artist', json_build_object('id', a.id, 'name', a.name),
+                    'name', acn.name,
+                    'joinphrase', NULLIF(acn.join_phrase, '')))
+                ORDER BY acn.position)
+            FROM artist_credit_name acn
+            JOIN artist a ON acn.artist = a.id
+            WHERE acn.artist_credit = r.artist_credit)"""
+
+# Recordings whose title and one of whose credited artists' names contain the
+# search terms; testing the artists with EXISTS returns each recording once
+_SQL_SEARCH_RECORDING = text(f"""
+    SELECT
+        r.id AS id,
+        r.name AS title,
+        r.length AS length,
+        {_ARTIST_CREDIT_JSON} AS artist_credit
+    FROM
+        recording r
+    WHERE
+        r.name ILIKE :title
+    AND
+        EXISTS (
+            SELECT 1
+            FROM artist_credit_name acn
+            JOIN artist a ON acn.artist = a.id
+            WHERE acn.artist_credit = r.artist_credit AND a.name ILIKE :artist)
+    LIMIT :limit
+""")
+
+# Releases of several recordings
+_SQL_RELEASES_FOR_RECORDINGS = text("""
+    SELECT
+        t.recording AS recording_id,
+        r.id AS id,
+        r.name AS title,
+        r.release_group AS release_group_id
+    FROM
+        release r
+    JOIN
+        medium m ON m.release = r.id
+    JOIN
+        track t ON t.medium = m.id
+    WHERE
+        t.recording IN :recording_ids
+""").bindparams(bindparam('recording_ids', expanding=True))
+
+# Several recordings with their artist credits, relationships and releases
+# aggregated into JSON
+_SQL_RECORDINGS_BY_IDS = text(f"""
+    SELECT
+        r.id AS id,
+        r.name AS title,
+        r.length AS length,
+        {_ARTIST_CREDIT_JSON} AS artist_credit,
+        (SELECT json_agg(json_build_object(
+                    'work_id', w.id,
+                    'work_name', w.name,
+                    'link_type', lt.name,
+                    'begin_date_year', l.begin_date_year,
+                    'begin_date_month', l.begin_date_month,
+                    'begin_date_day', l.begin_date_day,
+                    'end_date_year', l.end_date_year,
+                    'end_date_month', l.end_date_month,
+                    'end_date_day', l.end_date_day))
+            FROM l_recording_work lrw
+            JOIN link l ON lrw.link = l.id
+            JOIN link_type lt ON l.link_type = lt.id
+            JOIN work w ON lrw.entity1 = w.id
+            WHERE lrw.entity0 = r.id) AS work_relations,
+        (SELECT json_agg(json_build_object(
+                    'type', LOWER(lt.name),
+                    'artist', json_build_object('id', a.id, 'name', a.name)))
+            FROM l_artist_recording lar
+            JOIN link l ON lar.link = l.id
+            JOIN link_type lt ON l.link_type = lt.id
+            JOIN artist a ON lar.entity0 = a.id
+            WHERE lar.entity1 = r.id) AS artist_relations,
+        (SELECT json_agg(json_build_object(
+                    'id', rel.id,
+                    'title', rel.name,
+                    'release_group_id', rel.release_group))
+            FROM release rel
+            JOIN medium m ON m.release = rel.id
+            JOIN track t ON t.medium = m.id
+            WHERE t.recording = r.id) AS releases
+    FROM
+        recording r
+    WHERE
+        r.id IN :recording_ids
+""").bindparams(bindparam('recording_ids', expanding=True))
+
+# Several works with their type, ISWC and artist and label relationships
+# aggregated into JSON
+_SQL_WORKS_BY_IDS = text("""
+    SELECT
+        w.id AS id,
+        w.name AS name,
+        w.type AS type,
+        wt.name AS type_name,
+        (SELECT MIN(i.iswc) FROM iswc i WHERE i.work = w.id) AS iswc,
+        (SELECT json_agg(json_build_object(
+                    'type', LOWER(lt.name),
+                    'artist', json_build_object('id', a.id, 'name', a.name)))
+            FROM l_artist_work law
+            JOIN link l ON law.link = l.id
+            JOIN link_type lt ON l.link_type = lt.id
+            JOIN artist a ON law.entity0 = a.id
+            WHERE law.entity1 = w.id) AS artist_relations,
+        (SELECT json_agg(json_build_object(
+                    'type', LOWER(lt.name),
+                    'label', json_build_object('id', lb.id, 'name', lb.name)))
+            FROM l_label_work llw
+            JOIN link l ON llw.link = l.id
+            JOIN link_type lt ON l.link_type = lt.id
+            JOIN label lb ON llw.entity0 = lb.id
+            WHERE llw.entity1 = w.id) AS label_relations
+    FROM
+        work w
+    LEFT JOIN
+        work_type wt ON w.type = wt.id
+    WHERE
+        w.id IN :work_ids
+""").bindparams(bindparam('work_ids', expanding=True))
+
+# Writer and publisher relationships of the works linked to several recordings;
+# other label relationships are filtered out in the query
+_SQL_CREDITS_BULK = text("""
+    SELECT
+        lrw.entity0 AS recording_id,
+        w.id AS work_id,
+        w.name AS work_name,
+        (SELECT MIN(i.iswc) FROM iswc i WHERE i.work = w.id) AS iswc,
+        'artist' AS kind,
+        a.name AS name,
+        LOWER(lt.name) AS link_type
+    FROM
+        l_recording_work lrw
+    JOIN
+        work w ON w.id = lrw.entity1
+    JOIN
+        l_artist_work law ON law.entity1 = w.id
+    JOIN
+        link l ON law.link = l.id
+    JOIN
+        link_type lt ON l.link_type = lt.id
+    JOIN
+        artist a ON a.id = law.entity0
+    WHERE
+        lrw.entity0 IN :recording_ids
+
+    UNION ALL
+
+    SELECT
+        lrw.entity0 AS recording_id,
+        w.id AS work_id,
+        w.name AS work_name,
+        (SELECT MIN(i.iswc) FROM iswc i WHERE i.work = w.id) AS iswc,
+        'label' AS kind,
+        lb.name AS name,
+        LOWER(lt.name) AS link_type
+    FROM
+        l_recording_work lrw
+    JOIN
+        work w ON w.id = lrw.entity1
+    JOIN
+        l_label_work llw ON llw.entity1 = w.id
+    JOIN
+        link l ON llw.link = l.id
+    JOIN
+        link_type lt ON l.link_type = lt.id
+    JOIN
+        label lb ON lb.id = llw.entity0
+    WHERE
+        lrw.entity0 IN :recording_ids
+    AND
+        LOWER(lt.name) IN :publisher_types
+""").bindparams(bindparam('recording_ids', expanding=True),
+              bindparam('publisher_types', expanding=True))
+
+
+@functools.lru_cache(maxsize=16)
+def _search_recording_advanced_query(has_title: bool, has_artist: bool, has_release: bool,
+                                     use_trigram: bool):
+    """Build the search_recording_advanced query for a combination of filters.
+
+    Queries are memoized, so each of the few possible statements is composed
+    and parsed only once.
+
+    Args:
+        has_title: Whether to filter by title (bound as :title)
+        has_artist: Whether to filter by artist (bound as :artist)
+        has_release: Whether to filter by release (bound as :release, and as
+            :release_name for scoring with trigrams)
+        use_trigram: Match and score with pg_trgm instead of ILIKE substrings
+
+    Returns:
+        SQL text clause
+    """
+    where_clauses = []
+    score_terms = []
+
+    # Trigrams ignore case, and the GIN indexes from
+    # scripts/migrate_add_musicbrainz_trgm_indexes.py serve both forms as
+    # long as the columns are not wrapped in LOWER()
+    if has_title and use_trigram:
+        where_clauses.append("r.name % :title")
+        score_terms.append("0.5 * similarity(r.name, :title)")
+    elif has_title:
+        where_clauses.append("r.name ILIKE :title")
+
+    # Artists and releases are tested with EXISTS rather than joined, so
+    # recordings with several credited artists or releases are returned once
+    if has_artist:
+        artist_match = "a.name % :artist" if use_trigram else "a.name ILIKE :artist"
+        where_clauses.append(f"""EXISTS (
+            SELECT 1
+            FROM artist_credit_name acn
+            JOIN artist a ON acn.artist = a.id
+            WHERE acn.artist_credit = r.artist_credit AND {artist_match})""")
+        if use_trigram:
+            score_terms.append("""0.3 * (
+            SELECT MAX(similarity(a.name, :artist))
+            FROM artist_credit_name acn
+            JOIN artist a ON acn.artist = a.id
+            WHERE acn.artist_credit = r.artist_credit)""")
+
+    if has_release:
+        where_clauses.append("""EXISTS (
+            SELECT 1
+            FROM track t
+            JOIN medium m ON t.medium = m.id
+            JOIN release rel ON m.release = rel.id
+            WHERE t.recording = r.id AND rel.name ILIKE :release)""")
+
+    score_column = ""
+    order_by = ""
+    if use_trigram:
+        # Score the best matching release of each recording; without a
+        # release to match against, give a neutral score
+        if has_release:
+            score_terms.append("""0.2 * COALESCE((
+            SELECT MAX(similarity(rel.name, :release_name))
+            FROM track t
+            JOIN medium m ON t.medium = m.id
+            JOIN release rel ON m.release = rel.id
+            WHERE t.recording = r.id), 0)""")
+        else:
+            score_terms.append("0.1")
+        score_column = ",\n        " + " + ".join(score_terms) + " AS score"
+        # Fetch the best scoring recordings first
+        order_by = "\n    ORDER BY score DESC"
+
+    where = ("\n    WHERE\n        " + "\n    AND\n        ".join(where_clauses)
+             if where_clauses else "")
+
+    return text(f"""
+    SELECT
+        r.id AS id,
+        r.name AS title,
+        r.length AS length,
+        {_ARTIST_CREDIT_JSON} AS artist_credit{score_column}
+    FROM
+        recording r{where}{order_by}
+    LIMIT :limit
+""")
+
 
 class MusicBrainzDatabaseClient:
     """Client for interacting with a local MusicBrainz database."""
 
     # Define role mappings
-    COMPOSER_ROLES = ["composer", "writer", "songwriter"]
-    LYRICIST_ROLES = ["lyricist"]
-    ARRANGER_ROLES = ["arranger"]
-    PRODUCER_ROLES = ["producer"]
+    COMPOSER_ROLES = frozenset({"composer", "writer", "songwriter"})
+    LYRICIST_ROLES = frozenset({"lyricist"})
+    ARRANGER_ROLES = frozenset({"arranger"})
+    PRODUCER_ROLES = frozenset({"producer"})
+    # Standardized role for each writing relationship type; only these count
+    # when falling back to recording relationships
+    _WRITING_ROLE_MAP = {**{role: "composer" for role in COMPOSER_ROLES},
+                         **{role: "lyricist" for role in LYRICIST_ROLES},
+                         **{role: "arranger" for role in ARRANGER_ROLES}}
+    # Standardized role for each relationship type
+    ROLE_MAP = {**_WRITING_ROLE_MAP, **{role: "producer" for role in PRODUCER_ROLES}}
 
     # Define publisher types
-    PUBLISHER_TYPES = ["publisher", "publishing company"]
+    PUBLISHER_TYPES = frozenset({"publisher", "publishing company"})
 
-    def __init__(self, db_connection_string: str, pool_size: int = 5, max_overflow: int = 10):
+    def __init__(self, db_connection_string: str, pool_size: int = 5, max_overflow: int = 10,
+                 pool_pre_ping: bool = False, pool_recycle: int = 3600, pool_timeout: int = 30):
         """Initialize the MusicBrainz database client.
 
+        pool_pre_ping costs a roundtrip on every checkout and is incompatible
+        with PgBouncer in transaction pooling mode, where the ping can leave
+        server connections idle in transaction; recycling connections after
+        pool_recycle seconds keeps stale connections out of the pool instead,
+        so set it below any server or proxy idle timeout. Connections are
+        checked out most recently used first, so during quiet periods the
+        surplus connections stay idle until they are recycled.
+
         Args:
             db_connection_string: Database connection string for MusicBrainz DB
             pool_size: Connection pool size (default: 5)
             max_overflow: Maximum overflow connections (default: 10)
+            pool_pre_ping: Test connections before handing them out (default: False)
+            pool_recycle: Seconds after which connections are replaced (default: 3600)
+            pool_timeout: Seconds to wait for a free connection (default: 30)
         """
         self.db_connection_string = db_connection_string
 
@@ -38,14 +342,57 @@ class MusicBrainzDatabaseClient:
             poolclass=QueuePool,
             pool_size=pool_size,
             max_overflow=max_overflow,
-            pool_pre_ping=True  # Verify connections before using them
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+            pool_timeout=pool_timeout,
+            pool_use_lifo=True
         )
-        self.Session = sessionmaker(bind=self.engine)
+        # Thread-local sessions, so repeated calls from a worker thread reuse one
+        # session; read-only lookups never need objects expired on commit
+        self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+        # Per-thread nesting depth of _session_scope
+        self._scope_depth = threading.local()
+        # Whether the pg_trgm extension is installed, checked on first search
+        self._has_trigram = None
+        # Memoize lookups by ID, since catalogs often reach the same work
+        # through several recordings
+        self._cached_lookup = functools.lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._fetch_lookup)
+        # Credits of recent searches, since catalogs often repeat a track
+        self._credits_cache = OrderedDict()
+        self._credits_cache_lock = threading.Lock()
+        self._credits_cache_hits = 0
+        self._credits_cache_misses = 0
 
         logger.info(
             f"Initialized MusicBrainzDatabaseClient with connection to {db_connection_string}")
         logger.info(
-            f"Connection pool settings: pool_size={pool_size}, max_overflow={max_overflow}")
+            f"Connection pool settings: pool_size={pool_size}, max_overflow={max_overflow}, "
+            f"pool_pre_ping={pool_pre_ping}, pool_recycle={pool_recycle}, pool_timeout={pool_timeout}")
+
+    @contextmanager
+    def _session_scope(self):
+        """Provide the calling thread's session for the duration of a request.
+
+        Nested scopes reuse the session of the outermost one, so a top-level
+        call and every helper and lookup it makes share one session and pool
+        connection. The session is closed when the outermost scope exits.
+
+        Yields:
+            Database session
+        """
+        session = self.Session()
+        depth = getattr(self._scope_depth, 'value', 0)
+        self._scope_depth.value = depth + 1
+        try:
+            yield session
+        except Exception:
+            # A failed statement aborts the transaction for the outer scopes too
+            session.rollback()
+            raise
+        finally:
+            self._scope_depth.value = depth
+            if not depth:
+                session.close()
 
     def search_recording(self, title: str, artist: str, limit: int = 10) -> List[Dict]:
         """Search for recordings matching the title and artist.
@@ -59,100 +406,89 @@ class MusicBrainzDatabaseClient:
             List of matching recordings
         """
         try:
-            session = self.Session()
-
-            # Build the SQL query to match recordings
-            query = text("""
-                SELECT
-                    r.id AS id,
-                    r.name AS title,
-                    r.length AS length,
-                    a.id AS artist_id,
-                    a.name AS artist_name,
-                    ac.name AS artist_credit_name
-                FROM
-                    recording r
-                JOIN
-                    artist_credit ac ON r.artist_credit = ac.id
-                JOIN
-                    artist_credit_name acn ON acn.artist_credit = ac.id
-                JOIN
-                    artist a ON a.id = acn.artist
-                WHERE
-                    LOWER(r.name) LIKE LOWER(:title)
-                AND
-                    LOWER(a.name) LIKE LOWER(:artist)
-                LIMIT :limit
-            """)
-
-            params = {
-                'title': f'%{title}%',
-                'artist': f'%{artist}%',
-                'limit': limit
-            }
-
-            result = session.execute(query, params).fetchall()
-
-            # Convert result to list of dictionaries
-            recordings = []
-            for row in result:
-                recording_dict = dict(row._mapping)
+            with self._session_scope() as session:
+                params = {
+                    'title': f'%{title}%',
+                    'artist': f'%{artist}%',
+                    'limit': limit
+                }
 
-                # Add artist credit in the same format as API client
-                artist_credit = [{
-                    'artist': {
-                        'id': recording_dict.pop('artist_id'),
-                        'name': recording_dict.pop('artist_name')
-                    },
-                    'name': recording_dict.pop('artist_credit_name')
-                }]
-                recording_dict['artist-credit'] = artist_credit
+                result = session.execute(_SQL_SEARCH_RECORDING, params)
 
-                # Get releases for this recording
-                recording_dict['release-list'] = self._get_releases_for_recording(
-                    session, recording_dict['id'])
+                # Build the recordings, with the artist credit in the same
+                # format as the API client, directly from the rows
+                recordings = [self._recording_from_row(row) for row in result.mappings()]
 
-                recordings.append(recording_dict)
+                # Get releases for all recordings with a single query
+                self._add_releases(session, recordings)
 
-            return recordings
+                return recordings
         except Exception as e:
             logger.error(f"MusicBrainz database search_recording error: {e}")
             return []
-        finally:
-            session.close()
 
-    def _get_releases_for_recording(self, session, recording_id: str) -> List[Dict]:
-        """Get releases for a recording.
+    @staticmethod
+    def _recording_from_row(row) -> Dict:
+        """Build a search result from a recording search row.
+
+        Args:
+            row: Row mapping with recording and aggregated artist credit columns
+
+        Returns:
+            Recording dictionary
+        """
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'length': row['length'],
+            # json_agg returns NULL rather than an empty array when nothing matches
+            'artist-credit': row['artist_credit'] or []
+        }
+
+    def _add_releases(self, session, recordings: List[Dict]) -> None:
+        """Fill in the release lists of search results with a single query.
 
         Args:
             session: Database session
-            recording_id: MusicBrainz recording ID
+            recordings: Recording dictionaries, each with an 'id' key
+        """
+        if not recordings:
+            return
+        releases = self._get_releases_for_recordings(
+            session, list({recording['id'] for recording in recordings}))
+        for recording in recordings:
+            recording['release-list'] = releases.get(recording['id'], [])
+
+    def _get_releases_for_recordings(self, session, recording_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Get releases for several recordings.
+
+        Args:
+            session: Database session
+            recording_ids: MusicBrainz recording IDs
 
         Returns:
-            List of releases
+            Dictionary mapping recording IDs to their lists of releases
         """
         try:
-            query = text("""
-                SELECT
-                    r.id AS id,
-                    r.name AS title,
-                    r.release_group AS release_group_id
-                FROM
-                    release r
-                JOIN
-                    medium m ON m.release = r.id
-                JOIN
-                    track t ON t.medium = m.id
-                WHERE
-                    t.recording = :recording_id
-            """)
-
-            result = session.execute(
-                query, {'recording_id': recording_id}).fetchall()
-            return [dict(row._mapping) for row in result]
+            # Popular recordings have hundreds of releases, so stream the rows
+            # in batches rather than buffering the whole result
+            result = session.execute(_SQL_RELEASES_FOR_RECORDINGS, {'recording_ids': recording_ids},
+                                     execution_options={'yield_per': RESULT_BATCH_SIZE})
+
+            releases = defaultdict(list)
+            for row in result.mappings():
+                releases[row['recording_id']].append({
+                    'id': row['id'],
+                    'title': row['title'],
+                    'release_group_id': row['release_group_id']
+                })
+            return releases
         except Exception as e:
-            logger.error(f"Error getting releases for recording: {e}")
-            return []
+            logger.error(f"Error getting releases for recordings: {e}")
+            # The session is shared with the caller's scope, and on PostgreSQL
+            # a failed statement aborts its transaction until rolled back
+            session.rollback()
+            return {}
 
     def search_recording_advanced(self, title: str, artist: str, release: Optional[str] = None,
                                   limit: int = 10) -> List[Dict]:
@@ -168,102 +504,81 @@ class MusicBrainzDatabaseClient:
             List of matching recordings
         """
         try:
-            session = self.Session()
-
-            # Start building the query
-            query_str = """
-                SELECT
-                    r.id AS id,
-                    r.name AS title,
-                    r.length AS length,
-                    a.id AS artist_id,
-                    a.name AS artist_name,
-                    ac.name AS artist_credit_name
-                FROM
-                    recording r
-                JOIN
-                    artist_credit ac ON r.artist_credit = ac.id
-                JOIN
-                    artist_credit_name acn ON acn.artist_credit = ac.id
-                JOIN
-                    artist a ON a.id = acn.artist
-            """
-
-            params = {}
-            where_clauses = []
-
-            # Add title filter
-            if title:
-                where_clauses.append("LOWER(r.name) LIKE LOWER(:title)")
-                params['title'] = f'%{title}%'
-
-            # Add artist filter
-            if artist:
-                where_clauses.append("LOWER(a.name) LIKE LOWER(:artist)")
-                params['artist'] = f'%{artist}%'
-
-            # Add release filter if provided
-            if release:
-                query_str += """
-                    JOIN
-                        track t ON t.recording = r.id
-                    JOIN
-                        medium m ON t.medium = m.id
-                    JOIN
-                        release rel ON m.release = rel.id
-                """
-                where_clauses.append("LOWER(rel.name) LIKE LOWER(:release)")
-                params['release'] = f'%{release}%'
-
-            # Add WHERE clause
-            if where_clauses:
-                query_str += " WHERE " + " AND ".join(where_clauses)
-
-            # Add limit
-            query_str += " LIMIT :limit"
-            params['limit'] = limit
-
-            # Execute query
-            query = text(query_str)
-            result = session.execute(query, params).fetchall()
-
-            # Convert result to list of dictionaries
-            recordings = []
-            for row in result:
-                # Convert RowProxy to dict - use dict(row._mapping) instead of dict(row._mapping)
-                recording_dict = dict(row._mapping)
-
-                # Add artist credit in the same format as API client
-                artist_credit = [{
-                    'artist': {
-                        'id': recording_dict.pop('artist_id'),
-                        'name': recording_dict.pop('artist_name')
-                    },
-                    'name': recording_dict.pop('artist_credit_name')
-                }]
-                recording_dict['artist-credit'] = artist_credit
-
-                # Get releases for this recording
-                recording_dict['release-list'] = self._get_releases_for_recording(
-                    session, recording_dict['id'])
-
-                # Calculate score based on similarity to search terms
-                score = self._calculate_match_score(
-                    recording_dict, title, artist, release)
-                recording_dict['score'] = score
-
-                recordings.append(recording_dict)
-
-            # Sort by score descending
-            recordings.sort(key=lambda x: x.get('score', 0), reverse=True)
-
-            return recordings
+            with self._session_scope() as session:
+                # With pg_trgm, match names by trigram similarity so typos still
+                # match, and score candidates in the query so that only the best
+                # rows are returned; otherwise use substrings and score in Python
+                use_trigram = self._trigram_available(session)
+
+                params = {'limit': limit}
+                if title:
+                    params['title'] = title if use_trigram else f'%{title}%'
+                if artist:
+                    params['artist'] = artist if use_trigram else f'%{artist}%'
+                if release:
+                    params['release'] = f'%{release}%'
+                    if use_trigram:
+                        params['release_name'] = release
+
+                query = _search_recording_advanced_query(
+                    bool(title), bool(artist), bool(release), use_trigram)
+                result = session.execute(query, params)
+
+                # Build the recordings, with the artist credit in the same
+                # format as the API client, directly from the rows
+                recordings = []
+                for row in result.mappings():
+                    recording_dict = self._recording_from_row(row)
+                    if use_trigram:
+                        recording_dict['score'] = float(row['score'])
+                    recordings.append(recording_dict)
+
+                # Get releases for all recordings with a single query
+                self._add_releases(session, recordings)
+
+                if not use_trigram:
+                    # Lowercase the search terms once for all candidates
+                    title_lower = title.lower()
+                    artist_lower = artist.lower()
+                    release_lower = release.lower() if release else None
+
+                    for recording_dict in recordings:
+                        # Calculate score based on similarity to search terms
+                        score = self._calculate_match_score(
+                            recording_dict, title_lower, artist_lower, release_lower)
+                        recording_dict['score'] = score
+
+                    # Sort by score descending
+                    recordings.sort(key=lambda x: x.get('score', 0), reverse=True)
+
+                return recordings
         except Exception as e:
             logger.error(
                 f"MusicBrainz database search_recording_advanced error: {e}")
             return []
-        finally:
-            session.close()
+
+    def _trigram_available(self, session) -> bool:
+        """Check whether the pg_trgm extension is installed.
+
+        Args:
+            session: Database session
+
+        Returns:
+            True if trigram matching can be used, False otherwise
+        """
+        if self._has_trigram is None:
+            try:
+                has_trigram = session.execute(_SQL_TRIGRAM_AVAILABLE).first() is not None
+            except Exception as e:
+                # Only a successful check is remembered, so a dropped connection
+                # does not disable trigram matching for the life of the process
+                logger.warning(f"Could not check for the pg_trgm extension: {e}")
+                session.rollback()
+                return False
+            if not has_trigram:
+                logger.info("pg_trgm is not installed; using substring matching for searches")
+            self._has_trigram = has_trigram
+        return self._has_trigram
 
     def _calculate_match_score(self, recording: Dict, title: str, artist: str,
                                release: Optional[str] = None) -> float:
@@ -271,9 +586,9 @@ class MusicBrainzDatabaseClient:
 
         Args:
             recording: Recording data from MusicBrainz
-            title: Search title
-            artist: Search artist
-            release: Search release/album title (optional)
+            title: Lowercased search title
+            artist: Lowercased search artist
+            release: Lowercased search release/album title (optional)
 
         Returns:
             Confidence score between 0.0 and 1.0
@@ -285,32 +600,30 @@ class MusicBrainzDatabaseClient:
 
         # Title match (max 0.5)
         rec_title = recording.get('title', '').lower()
-        title_lower = title.lower()
 
-        if rec_title == title_lower:
+        if rec_title == title:
             title_score = 0.5
-        elif title_lower in rec_title or rec_title in title_lower:
+        elif title in rec_title or rec_title in title:
             title_score = 0.3
 
-        # Artist match (max 0.3)
-        rec_artist = recording.get(
-            'artist-credit', [{}])[0].get('artist', {}).get('name', '').lower()
-        artist_lower = artist.lower()
-
-        if rec_artist == artist_lower:
-            artist_score = 0.3
-        elif artist_lower in rec_artist or rec_artist in artist_lower:
-            artist_score = 0.2
+        # Artist match (max 0.3), using the best matching credited artist
+        for credit in recording.get('artist-credit') or ():
+            rec_artist = credit['artist']['name'].lower()
+            if rec_artist == artist:
+                artist_score = 0.3
+                break
+            elif artist in rec_artist or rec_artist in artist:
+                artist_score = 0.2
 
         # Release match (max 0.2)
-        if release and 'release-list' in recording:
-            release_lower = release.lower()
-            for rel in recording.get('release-list', []):
-                rel_title = rel.get('title', '').lower()
-                if rel_title == release_lower:
+        release_list = recording.get('release-list') if release else None
+        if release_list:
+            for rel in release_list:
+                rel_title = rel['title'].lower()
+                if rel_title == release:
                     release_score = 0.2
                     break
-                elif release_lower in rel_title or rel_title in release_lower:
+                elif release in rel_title or rel_title in release:
                     release_score = 0.1
                     break
         elif not release:
@@ -323,6 +636,8 @@ class MusicBrainzDatabaseClient:
     def get_recording_by_id(self, recording_id: str) -> Optional[Dict]:
         """Get detailed information about a recording.
 
+        Lookups are memoized for up to LOOKUP_CACHE_TTL seconds.
+
         Args:
             recording_id: MusicBrainz recording ID
 
@@ -330,370 +645,218 @@ class MusicBrainzDatabaseClient:
             Recording information or None
         """
         try:
-            session = self.Session()
-
-            # Query recording details
-            query = text("""
-                SELECT
-                    r.id AS id,
-                    r.name AS title,
-                    r.length AS length,
-                    r.artist_credit AS artist_credit_id
-                FROM
-                    recording r
-                WHERE
-                    r.id = :recording_id
-            """)
-
-            result = session.execute(
-                query, {'recording_id': recording_id}).fetchone()
-
-            if not result:
-                return None
-
-            recording_dict = dict(result._mapping)
-
-            # Get artist credit
-            artist_credit_id = recording_dict.pop('artist_credit_id')
-            recording_dict['artist-credit'] = self._get_artist_credit(
-                session, artist_credit_id)
-
-            # Get work relationships
-            recording_dict['work-relation-list'] = self._get_work_relations(
-                session, recording_id)
-
-            # Get artist relationships
-            recording_dict['artist-relation-list'] = self._get_artist_relations(
-                session, recording_id)
-
-            # Get releases
-            recording_dict['release-list'] = self._get_releases_for_recording(
-                session, recording_id)
-
-            return recording_dict
+            return self._lookup('recording', recording_id)
         except Exception as e:
             logger.error(
                 f"MusicBrainz database get_recording_by_id error: {e}")
             return None
-        finally:
-            session.close()
 
-    def _get_artist_credit(self, session, artist_credit_id: int) -> List[Dict]:
-        """Get artist credit information.
+    def _lookup(self, entity: str, entity_id: str) -> Optional[Dict]:
+        """Look up a recording or work by ID through the memoized fetch.
+
+        Failed lookups raise and are therefore never cached.
 
         Args:
-            session: Database session
-            artist_credit_id: Artist credit ID
+            entity: "recording" or "work"
+            entity_id: MusicBrainz ID
 
         Returns:
-            List of artist credit dictionaries
+            Recording or work information, or None if it does not exist
         """
-        try:
-            query = text("""
-                SELECT
-                    a.id AS artist_id,
-                    a.name AS artist_name,
-                    acn.name AS credit_name,
-                    acn.join_phrase
-                FROM
-                    artist_credit_name acn
-                JOIN
-                    artist a ON acn.artist = a.id
-                WHERE
-                    acn.artist_credit = :artist_credit_id
-                ORDER BY
-                    acn.position
-            """)
-
-            result = session.execute(
-                query, {'artist_credit_id': artist_credit_id}).fetchall()
-
-            artist_credits = []
-            for row in result:
-                row_dict = dict(row._mapping)
-                credit = {
-                    'artist': {
-                        'id': row_dict['artist_id'],
-                        'name': row_dict['artist_name']
-                    },
-                    'name': row_dict['credit_name']
-                }
+        # The TTL period number is part of the cache key, so entries from an
+        # earlier period are never returned
+        return self._cached_lookup(entity, entity_id, int(time.time() // LOOKUP_CACHE_TTL))
+
+    def _fetch_lookup(self, entity: str, entity_id: str, ttl_period: int) -> Optional[Dict]:
+        """Fetch a recording or work from the database; see _lookup."""
+        getter = self._get_recording_by_id if entity == 'recording' else self._get_work_by_id
+        with self._session_scope() as session:
+            return getter(session, entity_id)
+
+    def clear_cache(self) -> None:
+        """Discard memoized recording and work lookups and cached search credits.
+
+        Use after the MusicBrainz database has been updated, so that changes
+        are seen before the cached entries expire.
+        """
+        self._cached_lookup.cache_clear()
+        with self._credits_cache_lock:
+            self._credits_cache.clear()
 
-                if row_dict['join_phrase']:
-                    credit['joinphrase'] = row_dict['join_phrase']
+    def get_recordings_by_ids(self, recording_ids: List[str]) -> Dict[str, Dict]:
+        """Get detailed information about several recordings in one query.
 
-                artist_credits.append(credit)
+        Args:
+            recording_ids: MusicBrainz recording IDs
 
-            return artist_credits
+        Returns:
+            Dictionary mapping each recording ID found to its information
+        """
+        try:
+            with self._session_scope() as session:
+                return self._get_recordings_by_ids(session, recording_ids)
         except Exception as e:
-            logger.error(f"Error getting artist credit: {e}")
-            return []
+            logger.error(
+                f"MusicBrainz database get_recordings_by_ids error: {e}")
+            return {}
 
-    def _get_work_relations(self, session, recording_id: str) -> List[Dict]:
-        """Get work relationships for a recording.
+    def _get_recording_by_id(self, session, recording_id: str) -> Optional[Dict]:
+        """Get detailed information about a recording.
 
         Args:
             session: Database session
             recording_id: MusicBrainz recording ID
 
         Returns:
-            List of work relation dictionaries
+            Recording information or None
         """
-        try:
-            query = text("""
-                SELECT
-                    w.id AS work_id,
-                    w.name AS work_name,
-                    lt.name AS link_type,
-                    l.begin_date_year, l.begin_date_month, l.begin_date_day,
-                    l.end_date_year, l.end_date_month, l.end_date_day
-                FROM
-                    l_recording_work lrw
-                JOIN
-                    link l ON lrw.link = l.id
-                JOIN
-                    link_type lt ON l.link_type = lt.id
-                JOIN
-                    work w ON lrw.entity1 = w.id
-                WHERE
-                    lrw.entity0 = :recording_id
-                ORDER BY
-                    lt.name
-            """)
-
-            result = session.execute(
-                query, {'recording_id': recording_id}).fetchall()
-
-            work_relations = []
-            for row in result:
-                row_dict = dict(row._mapping)
-                relation = {
-                    'type': row_dict['link_type'],
-                    'work': {
-                        'id': row_dict['work_id'],
-                        'title': row_dict['work_name']
-                    }
-                }
+        recordings = self._get_recordings_by_ids(session, [recording_id])
+        return next(iter(recordings.values()), None)
 
-                # Add date information if available
-                if row_dict['begin_date_year']:
-                    relation['begin'] = f"{row_dict['begin_date_year']}"
-                    if row_dict['begin_date_month']:
-                        relation['begin'] += f"-{row_dict['begin_date_month']:02d}"
-                        if row_dict['begin_date_day']:
-                            relation['begin'] += f"-{row_dict['begin_date_day']:02d}"
+    def _get_recordings_by_ids(self, session, recording_ids: List[str]) -> Dict[str, Dict]:
+        """Get detailed information about several recordings.
 
-                if row_dict['end_date_year']:
-                    relation['end'] = f"{row_dict['end_date_year']}"
-                    if row_dict['end_date_month']:
-                        relation['end'] += f"-{row_dict['end_date_month']:02d}"
-                        if row_dict['end_date_day']:
-                            relation['end'] += f"-{row_dict['end_date_day']:02d}"
+        The artist credit, relationships and releases are aggregated by
+        subqueries, so all recordings are fetched in a single roundtrip. Apart
+        from work relation dates, the JSON is built in the API client's format.
 
-                work_relations.append(relation)
+        Args:
+            session: Database session
+            recording_ids: MusicBrainz recording IDs
 
-            return work_relations
-        except Exception as e:
-            logger.error(f"Error getting work relations: {e}")
-            return []
+        Returns:
+            Dictionary mapping each recording ID found to its information
+        """
+        result = session.execute(_SQL_RECORDINGS_BY_IDS, {'recording_ids': list(recording_ids)})
+
+        # json_agg returns NULL rather than an empty array when nothing matches
+        return {
+            row['id']: {
+                'id': row['id'],
+                'title': row['title'],
+                'length': row['length'],
+                'artist-credit': row['artist_credit'] or [],
+                'work-relation-list': [self._format_work_relation(relation)
+                                       for relation in row['work_relations'] or []],
+                'artist-relation-list': row['artist_relations'] or [],
+                'release-list': row['releases'] or [],
+            }
+            for row in result.mappings()
+        }
 
-    def _get_artist_relations(self, session, recording_id: str) -> List[Dict]:
-        """Get artist relationships for a recording.
+    @staticmethod
+    def _format_work_relation(row: Dict) -> Dict:
+        """Convert a recording-work link row to the API client's format.
 
         Args:
-            session: Database session
-            recording_id: MusicBrainz recording ID
+            row: Recording-work link row
 
         Returns:
-            List of artist relation dictionaries
+            Work relation dictionary
         """
-        try:
-            query = text("""
-                SELECT
-                    a.id AS artist_id,
-                    a.name AS artist_name,
-                    lt.name AS link_type
-                FROM
-                    l_artist_recording lar
-                JOIN
-                    link l ON lar.link = l.id
-                JOIN
-                    link_type lt ON l.link_type = lt.id
-                JOIN
-                    artist a ON lar.entity0 = a.id
-                WHERE
-                    lar.entity1 = :recording_id
-                ORDER BY
-                    lt.name
-            """)
-
-            result = session.execute(
-                query, {'recording_id': recording_id}).fetchall()
-
-            artist_relations = []
-            for row in result:
-                row_dict = dict(row._mapping)
-                relation = {
-                    'type': row_dict['link_type'],
-                    'artist': {
-                        'id': row_dict['artist_id'],
-                        'name': row_dict['artist_name']
-                    }
-                }
+        relation = {
+            'type': row['link_type'],
+            'work': {
+                'id': row['work_id'],
+                'title': row['work_name']
+            }
+        }
 
-                artist_relations.append(relation)
+        # Add date information if available
+        begin = MusicBrainzDatabaseClient._format_partial_date(
+            row['begin_date_year'], row['begin_date_month'], row['begin_date_day'])
+        if begin:
+            relation['begin'] = begin
 
-            return artist_relations
-        except Exception as e:
-            logger.error(f"Error getting artist relations: {e}")
-            return []
+        end = MusicBrainzDatabaseClient._format_partial_date(
+            row['end_date_year'], row['end_date_month'], row['end_date_day'])
+        if end:
+            relation['end'] = end
+
+        return relation
+
+    @staticmethod
+    def _format_partial_date(year: Optional[int], month: Optional[int],
+                             day: Optional[int]) -> Optional[str]:
+        """Format a MusicBrainz partial date as YYYY, YYYY-MM or YYYY-MM-DD.
+
+        Args:
+            year: Year, or None if unknown
+            month: Month, or None if unknown
+            day: Day, or None if unknown
+
+        Returns:
+            Formatted date, or None if the year is unknown
+        """
+        if not year:
+            return None
+        if not month:
+            return f"{year}"
+        if not day:
+            return f"{year}-{month:02d}"
+        return f"{year}-{month:02d}-{day:02d}"
 
     def get_work_by_id(self, work_id: str) -> Optional[Dict]:
-        """Get detailed information about a work."""
+        """Get detailed information about a work.
+
+        Lookups are memoized for up to LOOKUP_CACHE_TTL seconds.
+
+        Args:
+            work_id: MusicBrainz work ID
+
+        Returns:
+            Work information or None
+        """
         try:
-            session = self.Session()
-
-            # Modified query to join with the iswc table
-            query = text("""
-                SELECT
-                    w.id AS id,
-                    w.name AS name,
-                    w.type AS type,
-                    wt.name AS type_name,
-                    i.iswc AS iswc
-                FROM
-                    work w
-                LEFT JOIN
-                    work_type wt ON w.type = wt.id
-                LEFT JOIN
-                    iswc i ON i.work = w.id
-                WHERE
-                    w.id = :work_id
-            """)
-
-            result = session.execute(query, {'work_id': work_id}).fetchone()
-
-            if not result:
-                return None
-
-            # Fix the row mapping issue
-            work_dict = dict(result._mapping) if hasattr(
-                result, '_mapping') else dict(result)
-
-            # Get artist relationships (composers, lyricists, etc.)
-            work_dict['artist-relation-list'] = self._get_work_artist_relations(
-                session, work_id)
-
-            # Get label relationships (publishers)
-            work_dict['label-relation-list'] = self._get_work_label_relations(
-                session, work_id)
-
-            return work_dict
+            return self._lookup('work', work_id)
         except Exception as e:
             logger.error(f"MusicBrainz database get_work_by_id error: {e}")
             return None
-        finally:
-            session.close()
 
-    def _get_work_artist_relations(self, session, work_id: str) -> List[Dict]:
-        """Get artist relationships for a work.
+    def _get_work_by_id(self, session, work_id: str) -> Optional[Dict]:
+        """Get detailed information about a work.
 
         Args:
             session: Database session
             work_id: MusicBrainz work ID
 
         Returns:
-            List of artist relation dictionaries
+            Work information or None
         """
-        try:
-            query = text("""
-                SELECT
-                    a.id AS artist_id,
-                    a.name AS artist_name,
-                    lt.name AS link_type
-                FROM
-                    l_artist_work law
-                JOIN
-                    link l ON law.link = l.id
-                JOIN
-                    link_type lt ON l.link_type = lt.id
-                JOIN
-                    artist a ON law.entity0 = a.id
-                WHERE
-                    law.entity1 = :work_id
-                ORDER BY
-                    lt.name
-            """)
-
-            result = session.execute(query, {'work_id': work_id}).fetchall()
-
-            artist_relations = []
-            for row in result:
-                row_dict = dict(row._mapping)
-                relation = {
-                    'type': row_dict['link_type'],
-                    'artist': {
-                        'id': row_dict['artist_id'],
-                        'name': row_dict['artist_name']
-                    }
-                }
-
-                artist_relations.append(relation)
+        return self._get_works_by_ids(session, [work_id]).get(work_id)
 
-            return artist_relations
-        except Exception as e:
-            logger.error(f"Error getting work artist relations: {e}")
-            return []
+    def _get_works_by_ids(self, session, work_ids: List[str]) -> Dict[str, Dict]:
+        """Get detailed information about several works.
 
-    def _get_work_label_relations(self, session, work_id: str) -> List[Dict]:
-        """Get label (publisher) relationships for a work.
+        The artist (composers, lyricists, etc.) and label (publishers)
+        relationships are aggregated by subqueries, so all works are fetched
+        in a single roundtrip.
 
         Args:
             session: Database session
-            work_id: MusicBrainz work ID
+            work_ids: MusicBrainz work IDs
 
         Returns:
-            List of label relation dictionaries
+            Dictionary mapping each work ID found to its information
         """
-        try:
-            query = text("""
-                SELECT
-                    l.id AS label_id,
-                    l.name AS label_name,
-                    lt.name AS link_type
-                FROM
-                    l_label_work llw
-                JOIN
-                    link lnk ON llw.link = lnk.id
-                JOIN
-                    link_type lt ON lnk.link_type = lt.id
-                JOIN
-                    label l ON llw.entity0 = l.id
-                WHERE
-                    llw.entity1 = :work_id
-                ORDER BY
-                    lt.name
-            """)
-
-            result = session.execute(query, {'work_id': work_id}).fetchall()
-
-            label_relations = []
-            for row in result:
-                row_dict = dict(row._mapping)
-                relation = {
-                    'type': row_dict['link_type'],
-                    'label': {
-                        'id': row_dict['label_id'],
-                        'name': row_dict['label_name']
-                    }
-                }
-
-                label_relations.append(relation)
-
-            return label_relations
-        except Exception as e:
-            logger.error(f"Error getting work label relations: {e}")
-            return []
+        if not work_ids:
+            return {}
+
+        result = session.execute(_SQL_WORKS_BY_IDS, {'work_ids': list(work_ids)})
+
+        # json_agg returns NULL rather than an empty array when nothing matches
+        return {
+            row['id']: {
+                'id': row['id'],
+                'name': row['name'],
+                'type': row['type'],
+                'type_name': row['type_name'],
+                'iswc': row['iswc'],
+                'artist-relation-list': row['artist_relations'] or [],
+                'label-relation-list': row['label_relations'] or [],
+            }
+            for row in result.mappings()
+        }
 
     def get_work_credits(self, recording_id: str) -> List[Dict]:
         """Get songwriter credits for a work linked to a recording.
@@ -705,97 +868,161 @@ class MusicBrainzDatabaseClient:
             List of songwriter credits
         """
         try:
-            session = self.Session()
-
-            # Get recording info with work relationships
-            recording = self.get_recording_by_id(recording_id)
-
-            if not recording:
-                return []
-
-            credits = []
-
-            # Extract works
-            for work_rel in recording.get('work-relation-list', []):
-                if 'work' in work_rel:
-                    work_id = work_rel['work']['id']
-                    work_title = work_rel['work'].get('title', '')
-
-                    # Get work details with relationship information
-                    work = self.get_work_by_id(work_id)
-
-                    if work:
-                        # Extract artist relationships (composers, lyricists, etc.)
-                        for artist_rel in work.get('artist-relation-list', []):
-                            role = artist_rel.get('type', '').lower()
-
-                            # Determine standardized role
-                            if role in self.COMPOSER_ROLES:
-                                standardized_role = 'composer'
-                            elif role in self.LYRICIST_ROLES:
-                                standardized_role = 'lyricist'
-                            elif role in self.ARRANGER_ROLES:
-                                standardized_role = 'arranger'
-                            elif role in self.PRODUCER_ROLES:
-                                standardized_role = 'producer'
-                            else:
-                                standardized_role = role
-
-                            credits.append({
-                                'name': artist_rel['artist']['name'],
-                                'role': standardized_role,
-                                'work_title': work_title,
-                                'confidence_score': 0.9,  # High confidence for direct work credits
-                                'iswc': work.get('iswc'),
-                                'source': 'musicbrainz_db',
-                                'source_id': work_id
-                            })
-
-                        # Extract publisher relationships
-                        for label_rel in work.get('label-relation-list', []):
-                            rel_type = label_rel.get('type', '').lower()
-                            if rel_type in self.PUBLISHER_TYPES:
-                                credits.append({
-                                    'name': label_rel['label']['name'],
-                                    'role': 'publisher',
-                                    'work_title': work_title,
-                                    'confidence_score': 0.9,  # High confidence for direct publishers
-                                    'iswc': work.get('iswc'),
-                                    'source': 'musicbrainz_db',
-                                    'source_id': work_id
-                                })
-
-            # If no works were found, try to get composer credits directly from recording
-            if not credits and 'artist-relation-list' in recording:
-                for artist_rel in recording.get('artist-relation-list', []):
-                    role = artist_rel.get('type', '').lower()
-
-                    if role in self.COMPOSER_ROLES + self.LYRICIST_ROLES + self.ARRANGER_ROLES:
-                        # Determine standardized role
-                        if role in self.COMPOSER_ROLES:
-                            standardized_role = 'composer'
-                        elif role in self.LYRICIST_ROLES:
-                            standardized_role = 'lyricist'
-                        elif role in self.ARRANGER_ROLES:
-                            standardized_role = 'arranger'
-                        else:
-                            standardized_role = role
+            # Share one session between the recording and work lookups
+            with self._session_scope() as session:
+                # Get recording info with work relationships
+                recording = self._lookup('recording', recording_id)
 
-                        credits.append({
-                            'name': artist_rel['artist']['name'],
-                            'role': standardized_role,
-                            'work_title': recording.get('title', ''),
-                            'confidence_score': 0.7,  # Lower confidence for recording artist credits
-                            'source': 'musicbrainz_db',
-                            'source_id': recording_id
-                        })
+                if not recording:
+                    return []
 
-            return credits
+                return self._get_recording_credits(session, recording)
         except Exception as e:
             logger.error(f"MusicBrainz database get_work_credits error: {e}")
             return []
-        finally:
-            session.close()
+
+    def _get_recording_credits(self, session, recording: Dict) -> List[Dict]:
+        """Get songwriter credits for the works linked to a fetched recording.
+
+        All linked works are fetched with a single query.
+
+        Args:
+            session: Database session
+            recording: Recording information from _get_recordings_by_ids
+
+        Returns:
+            List of songwriter credits
+        """
+        credits = []
+
+        # Relationship types are lowercased by the queries, so they can be
+        # looked up directly. Bind the lookup tables to locals for the loops below
+        role_map = self.ROLE_MAP
+        publisher_types = self.PUBLISHER_TYPES
+
+        # Get work details with relationship information
+        work_rels = [work_rel for work_rel in recording.get('work-relation-list', [])
+                     if 'work' in work_rel]
+        works = self._get_works_by_ids(
+            session, list(dict.fromkeys(work_rel['work']['id'] for work_rel in work_rels)))
+
+        # Extract works
+        for work_rel in work_rels:
+            work_id = work_rel['work']['id']
+            work_title = work_rel['work'].get('title', '')
+
+            work = works.get(work_id)
+
+            if work:
+                # Extract artist relationships (composers, lyricists, etc.)
+                for artist_rel in work.get('artist-relation-list', []):
+                    role = artist_rel.get('type', '')
+
+                    standardized_role = role_map.get(role, role)
+
+                    credits.append({
+                        'name': artist_rel['artist']['name'],
+                        'role': standardized_role,
+                        'work_title': work_title,
+                        'confidence_score': 0.9,  # High confidence for direct work credits
+                        'iswc': work.get('iswc'),
+                        'source': 'musicbrainz_db',
+                        'source_id': work_id
+                    })
+
+                # Extract publisher relationships
+                for label_rel in work.get('label-relation-list', []):
+                    rel_type = label_rel.get('type', '')
+                    if rel_type in publisher_types:
+                        credits.append({
+                            'name': label_rel['label']['name'],
+                            'role': 'publisher',
+                            'work_title': work_title,
+                            'confidence_score': 0.9,  # High confidence for direct publishers
+                            'iswc': work.get('iswc'),
+                            'source': 'musicbrainz_db',
+                            'source_id': work_id
+                        })
+
+        # If no works were found, try to get composer credits directly from recording
+        if not credits:
+            credits = self._get_recording_artist_credits(recording)
+
+        return credits
+
+    def _get_recording_artist_credits(self, recording: Dict) -> List[Dict]:
+        """Get songwriter credits from the artist relationships of a recording.
+
+        Used when no credits were found on the works linked to the recording.
+
+        Args:
+            recording: Recording information from _get_recordings_by_ids
+
+        Returns:
+            List of songwriter credits
+        """
+        credits = []
+        writing_role_map = self._WRITING_ROLE_MAP
+
+        for artist_rel in recording.get('artist-relation-list', []):
+            role = artist_rel.get('type', '')
+
+            standardized_role = writing_role_map.get(role)
+            if standardized_role:
+
+                credits.append({
+                    'name': artist_rel['artist']['name'],
+                    'role': standardized_role,
+                    'work_title': recording.get('title', ''),
+                    'confidence_score': 0.7,  # Lower confidence for recording artist credits
+                    'source': 'musicbrainz_db',
+                    'source_id': recording['id']
+                })
+
+        return credits
+
+    def _get_credits_bulk(self, session, recording_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Get the work credits of several recordings with a single query.
+
+        Returns the same credits as the work part of _get_recording_credits,
+        but fetches the writers and publishers of every work linked to the
+        recordings in one roundtrip instead of one lookup per recording and work.
+
+        Args:
+            session: Database session
+            recording_ids: MusicBrainz recording IDs
+
+        Returns:
+            Dictionary mapping recording IDs to their lists of work credits;
+            recordings without any are missing
+        """
+        # Batches can link many works, so stream the rows in batches
+        params = {
+            'recording_ids': list(recording_ids),
+            'publisher_types': list(self.PUBLISHER_TYPES)
+        }
+        result = session.execute(_SQL_CREDITS_BULK, params,
+                                 execution_options={'yield_per': RESULT_BATCH_SIZE})
+
+        role_map = self.ROLE_MAP
+
+        credits = defaultdict(list)
+        for row in result.mappings():
+            link_type = row['link_type']
+            # Label rows are publishers only
+            role = role_map.get(link_type, link_type) if row['kind'] == 'artist' else 'publisher'
+
+            credits[row['recording_id']].append({
+                'name': row['name'],
+                'role': role,
+                'work_title': row['work_name'],
+                'confidence_score': 0.9,  # High confidence for direct work credits
+                'iswc': row['iswc'],
+                'source': 'musicbrainz_db',
+                'source_id': row['work_id']
+            })
+
+        return credits
 
     def get_credits_by_title_artist(self, title: str, artist: str, release: Optional[str] = None) -> List[Dict]:
         """Get songwriter credits by searching for title and artist.
@@ -808,48 +1035,206 @@ class MusicBrainzDatabaseClient:
         Returns:
             List of songwriter credits
         """
-        all_credits = []
+        return self.get_credits_batch([(title, artist, release)])[0]
 
-        # Search for recordings
-        recordings = self.search_recording_advanced(title, artist, release)
+    def get_credits_batch(self, tracks: List[Tuple[str, str, Optional[str]]]) -> List[List[Dict]]:
+        """Get songwriter credits for several tracks.
 
-        if not recordings:
-            logger.info(f"No recordings found for '{title}' by '{artist}'")
-            return []
+        Tracks whose title, artist and release differ only in case and
+        whitespace, which the searches ignore, share one search. Credits are
+        cached for up to LOOKUP_CACHE_TTL seconds, and the tracks that miss the
+        cache are searched on one shared session, after which the credits of
+        the top matches of all of them are fetched together. A batch
+        therefore costs one search per new track plus one or two credit
+        queries in total.
+
+        Args:
+            tracks: (title, artist, release) tuples; release may be None
 
-        # Process top 3 recording matches (or fewer if less available)
-        for i, recording in enumerate(recordings[:3]):
-            recording_id = recording.get('id')
-            if not recording_id:
-                continue
+        Returns:
+            List of songwriter credits for each track, in input order
+        """
+        # The TTL period number is part of the cache key, so entries from an
+        # earlier period are never returned
+        period = int(time.time() // LOOKUP_CACHE_TTL)
+        keys = [self._credits_cache_key(*track) for track in tracks]
+
+        results = {}
+        with self._credits_cache_lock:
+            for key in keys:
+                if key in results:
+                    self._credits_cache_hits += 1
+                    continue
+                credits = self._credits_cache.get((key, period))
+                if credits is None:
+                    self._credits_cache_misses += 1
+                else:
+                    self._credits_cache_hits += 1
+                    self._credits_cache.move_to_end((key, period))
+                results[key] = credits
+
+        missing_keys = [key for key, credits in results.items() if credits is None]
+        if missing_keys:
+            try:
+                fetched = self._search_credits(missing_keys)
+            except Exception as e:
+                logger.error(f"MusicBrainz database get_credits_batch error: {e}")
+                fetched = {key: [] for key in missing_keys}
+            else:
+                with self._credits_cache_lock:
+                    for key, credits in fetched.items():
+                        self._credits_cache[(key, period)] = credits
+                    while len(self._credits_cache) > CREDITS_CACHE_SIZE:
+                        self._credits_cache.popitem(last=False)
+            results.update(fetched)
+
+        # Give every track its own credit dicts, since callers may modify them,
+        # labelled with the track's own search terms
+        return [self._label_credits(results[key], *track) for key, track in zip(keys, tracks)]
+
+    @property
+    def credits_cache_stats(self) -> Dict[str, int]:
+        """Hit and miss counts and current size of the search credits cache."""
+        with self._credits_cache_lock:
+            return {
+                'hits': self._credits_cache_hits,
+                'misses': self._credits_cache_misses,
+                'size': len(self._credits_cache)
+            }
 
-            # Get credits for this recording
-            credits = self.get_work_credits(recording_id)
+    @staticmethod
+    def _credits_cache_key(title: Optional[str], artist: Optional[str],
+                           release: Optional[str]) -> Tuple[str, str, str]:
+        """Normalize search terms by case and whitespace, which searches ignore.
 
-            # Adjust confidence based on recording match position
-            position_factor = 1.0 if i == 0 else (0.9 if i == 1 else 0.8)
-            for credit in credits:
-                # Scale the confidence by position factor and recording score
-                recording_score = recording.get('score', 0.5)
-                credit['confidence_score'] = credit['confidence_score'] * \
-                    position_factor * recording_score
-                credit['recording_id'] = recording_id
-                credit['recording_title'] = recording.get('title')
+        Args:
+            title: Track title
+            artist: Artist name
+            release: Release/album title (optional)
 
-                # Also store original search terms for reference
-                credit['search_title'] = title
-                credit['search_artist'] = artist
-                if release:
-                    credit['search_release'] = release
+        Returns:
+            (title, artist, release) tuple of normalized terms
+        """
+        return tuple(' '.join(term.split()).lower() if term else ''
+                     for term in (title, artist, release))
+
+    def _search_credits(self, keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], List[Dict]]:
+        """Search for several tracks and get the credits of their top matches.
+
+        Args:
+            keys: Normalized (title, artist, release) tuples from _credits_cache_key
+
+        Returns:
+            Dictionary mapping each key to its list of songwriter credits
+
+        Raises:
+            Exception: If the credits could not be fetched
+        """
+        # Share one session between the searches and the queries that follow them
+        with self._session_scope() as session:
+            # Process top 3 recording matches of each track (or fewer if less available)
+            top_recordings = {}
+            for title, artist, release in keys:
+                recordings = self.search_recording_advanced(title, artist, release or None)
+                if not recordings:
+                    logger.info(f"No recordings found for '{title}' by '{artist}'")
+                top_recordings[(title, artist, release)] = [
+                    (i, rec) for i, rec in enumerate(recordings[:3]) if rec.get('id')]
+
+            # Fetch the credits of all matched recordings at once
+            recording_ids = list(dict.fromkeys(
+                rec['id'] for matches in top_recordings.values() for _, rec in matches))
+            recording_credits = self._get_credits_for_recordings(session, recording_ids)
+
+        return {
+            key: self._combine_recording_credits(matches, recording_credits)
+            for key, matches in top_recordings.items()
+        }
+
+    @staticmethod
+    def _label_credits(credits: List[Dict], title: str, artist: str,
+                       release: Optional[str] = None) -> List[Dict]:
+        """Copy credits, storing the original search terms for reference.
+
+        Args:
+            credits: Songwriter credits
+            title: Searched track title
+            artist: Searched artist name
+            release: Searched release/album title (optional)
+
+        Returns:
+            Copied songwriter credits
+        """
+        labelled = []
+        for credit in credits:
+            credit = dict(credit)
+            credit['search_title'] = title
+            credit['search_artist'] = artist
+            if release:
+                credit['search_release'] = release
+            labelled.append(credit)
+        return labelled
+
+    def _get_credits_for_recordings(self, session, recording_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Get songwriter credits for several recordings with at most two queries.
+
+        Args:
+            session: Database session
+            recording_ids: MusicBrainz recording IDs
+
+        Returns:
+            Dictionary mapping recording IDs to their lists of songwriter credits
+        """
+        if not recording_ids:
+            return {}
+
+        recording_credits = self._get_credits_bulk(session, recording_ids)
+
+        # Recordings without work credits fall back to their own artist
+        # relationships, which are fetched together in a second query
+        missing_ids = [recording_id for recording_id in recording_ids
+                       if recording_id not in recording_credits]
+        if missing_ids:
+            for recording_id, details in self._get_recordings_by_ids(session, missing_ids).items():
+                recording_credits[recording_id] = self._get_recording_artist_credits(details)
 
-            all_credits.extend(credits)
+        return recording_credits
 
-        # Remove duplicates (same person in same role)
+    def _combine_recording_credits(self, top_recordings: List[Tuple[int, Dict]],
+                                   recording_credits: Dict[str, List[Dict]]) -> List[Dict]:
+        """Weight and deduplicate the credits of a track's top recording matches.
+
+        Args:
+            top_recordings: (search position, recording) pairs of the top matches
+            recording_credits: Credits of each recording, from _get_credits_for_recordings
+
+        Returns:
+            List of songwriter credits
+        """
+        # Deduplicate (same person in same role) while collecting, keeping
+        # the credit with the highest confidence
         unique_credits = {}
-        for credit in all_credits:
-            key = f"{credit['name']}_{credit['role']}"
-            # Keep the one with highest confidence
-            if key not in unique_credits or credit['confidence_score'] > unique_credits[key]['confidence_score']:
+
+        for i, recording in top_recordings:
+            recording_id = recording['id']
+
+            # Adjust confidence based on recording match position
+            position_factor = 1.0 if i == 0 else (0.9 if i == 1 else 0.8)
+            # Scale the confidence by position factor and recording score
+            confidence_factor = position_factor * recording.get('score', 0.5)
+            for credit in recording_credits.get(recording_id, []):
+                key = (credit['name'], credit['role'])
+                confidence_score = credit['confidence_score'] * confidence_factor
+                previous = unique_credits.get(key)
+                if previous is not None and confidence_score <= previous['confidence_score']:
+                    continue
+
+                # Recordings can match several tracks, so copy their credits
+                # before adding the match details
+                credit = dict(credit)
+                credit['confidence_score'] = confidence_score
+                credit['recording_id'] = recording_id
+                credit['recording_title'] = recording.get('title')
                 unique_credits[key] = credit
 
         return list(unique_credits.values())
@@ -3,7 +3,8 @@
 import logging
 from typing import Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import create_engine, or_
+from sqlalchemy import create_engine, or_, select
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from songwriter_id.database.models import Track
@@ -14,16 +15,20 @@ logger = logging.getLogger(__name__)
 class CatalogImporter:
     """Importer for adding catalog data to the database."""
 
-    def __init__(self, db_connection: str, normalizer: Optional[TrackNormalizer] = None):
+    def __init__(self, db_connection: str, normalizer: Optional[TrackNormalizer] = None,
+                 db_engine: Optional[Engine] = None):
         """Initialize the catalog importer.
         
         Args:
             db_connection: Database connection string
             normalizer: Optional track normalizer instance
+            db_engine: Existing engine to share instead of creating one (optional)
         """
         self.db_connection = db_connection
-        self.engine = create_engine(db_connection)
-        self.Session = sessionmaker(bind=self.engine)
+        self.engine = db_engine or create_engine(db_connection)
+        # Imports look up duplicates through an in-memory index rather than
+        # queries, so autoflush and post-commit expiry only add overhead
+        self.Session = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
         self.normalizer = normalizer or TrackNormalizer()
     
     def import_tracks(self, tracks_data: List[Dict]) -> Tuple[int, int, List[str]]:
@@ -35,48 +40,13 @@ class CatalogImporter:
         Returns:
             Tuple containing (tracks_added, tracks_skipped, error_messages)
         """
-        tracks_added = 0
-        tracks_skipped = 0
-        errors = []
-        
         logger.info(f"Importing {len(tracks_data)} tracks into the database")
         
         session = self.Session()
         try:
-            for track_data in tracks_data:
-                try:
-                    # Skip tracks without required fields
-                    if not self._validate_track_data(track_data):
-                        tracks_skipped += 1
-                        errors.append(f"Skipped track: Missing required fields in {track_data}")
-                        continue
-                    
-                    # Normalize the track data
-                    normalized_data = self.normalizer.normalize_track_data(track_data)
-                    
-                    # Check if track already exists by ISRC, title and artist
-                    existing_track = self._find_existing_track(
-                        session, 
-                        normalized_data.get('isrc'),
-                        normalized_data['title'], 
-                        normalized_data['artist_name']
-                    )
-                    
-                    if existing_track:
-                        # Update the existing track with new data if needed
-                        self._update_track(existing_track, normalized_data)
-                        tracks_skipped += 1
-                    else:
-                        # Create a new track
-                        track = self._create_track(normalized_data)
-                        session.add(track)
-                        tracks_added += 1
-                
-                except Exception as e:
-                    tracks_skipped += 1
-                    error_msg = f"Error processing track: {e} - Data: {track_data}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+            track_index = self._load_track_index(session)
+            tracks_added, tracks_skipped, errors = self._import_batch(
+                session, tracks_data, track_index)
             
             # Commit changes to the database
             session.commit()
@@ -88,8 +58,7 @@ class CatalogImporter:
             session.rollback()
             error_msg = f"Database error during import: {e}"
             logger.error(error_msg)
-            errors.append(error_msg)
-            return 0, len(tracks_data), errors
+            return 0, len(tracks_data), [error_msg]
             
         finally:
             session.close()
@@ -97,6 +66,10 @@ class CatalogImporter:
     def bulk_import_tracks(self, tracks_data: List[Dict], batch_size: int = 100) -> Tuple[int, int, List[str]]:
         """Import tracks in batches for improved performance.
         
+        All batches run in a single transaction that is committed once at the
+        end. Each batch is wrapped in a savepoint so that a failing batch is
+        rolled back without discarding the others.
+        
         Args:
             tracks_data: List of track dictionaries
             batch_size: Number of tracks to process in each batch
@@ -110,20 +83,141 @@ class CatalogImporter:
         
         logger.info(f"Bulk importing {len(tracks_data)} tracks in batches of {batch_size}")
         
-        # Process tracks in batches
-        for i in range(0, len(tracks_data), batch_size):
-            batch = tracks_data[i:i+batch_size]
-            added, skipped, errors = self.import_tracks(batch)
+        session = self.Session()
+        try:
+            # Load the existing track index once and share it across all batches
+            track_index = self._load_track_index(session)
+            
+            # Process tracks in batches
+            for i in range(0, len(tracks_data), batch_size):
+                batch = tracks_data[i:i+batch_size]
+                savepoint = session.begin_nested()
+                try:
+                    added, skipped, errors = self._import_batch(session, batch, track_index)
+                    savepoint.commit()
+                except Exception as e:
+                    savepoint.rollback()
+                    self._discard_unflushed_tracks(track_index)
+                    error_msg = f"Database error during import: {e}"
+                    logger.error(error_msg)
+                    added, skipped, errors = 0, len(batch), [error_msg]
+                
+                total_added += added
+                total_skipped += skipped
+                all_errors.extend(errors)
+                
+                logger.info(f"Batch {i//batch_size + 1} complete: {added} added, {skipped} skipped")
             
-            total_added += added
-            total_skipped += skipped
-            all_errors.extend(errors)
+            # Commit all batches to the database at once
+            session.commit()
             
-            logger.info(f"Batch {i//batch_size + 1} complete: {added} added, {skipped} skipped")
+        except Exception as e:
+            session.rollback()
+            error_msg = f"Database error during import: {e}"
+            logger.error(error_msg)
+            return 0, len(tracks_data), all_errors + [error_msg]
+            
+        finally:
+            session.close()
         
         logger.info(f"Bulk import complete: {total_added} tracks added, {total_skipped} tracks skipped")
         return total_added, total_skipped, all_errors
     
+    def _import_batch(self, session: Session, tracks_data: List[Dict],
+                      track_index: Dict[str, Dict]) -> Tuple[int, int, List[str]]:
+        """Add a batch of tracks to the session and flush it without committing.
+        
+        Args:
+            session: Database session
+            tracks_data: List of track dictionaries
+            track_index: Index of existing tracks from _load_track_index
+        
+        Returns:
+            Tuple containing (tracks_added, tracks_skipped, error_messages)
+        """
+        tracks_added = 0
+        tracks_skipped = 0
+        errors = []
+        
+        new_tracks = []
+        pending_updates = []
+        for track_data in tracks_data:
+            try:
+                # Skip tracks without required fields
+                if not self._validate_track_data(track_data):
+                    tracks_skipped += 1
+                    errors.append(f"Skipped track: Missing required fields in {track_data}")
+                    continue
+                
+                # Normalize the track data
+                normalized_data = self.normalizer.normalize_track_data(track_data)
+                
+                # Check if track already exists by ISRC, title and artist
+                existing_track = self._find_existing_track(
+                    track_index,
+                    normalized_data.get('isrc'),
+                    normalized_data['title'], 
+                    normalized_data['artist_name']
+                )
+                
+                if isinstance(existing_track, Track):
+                    # Duplicate of a track added earlier in this batch; index
+                    # an ISRC the update adds so later rows match it
+                    self._update_track(existing_track, normalized_data)
+                    self._index_track(track_index, existing_track, existing_track.isrc,
+                                      existing_track.title, existing_track.artist_name)
+                    tracks_skipped += 1
+                elif existing_track is not None:
+                    # Update the existing track with new data if needed. The
+                    # update may add an ISRC, so index it now for later rows
+                    # and correct the entry once the track is loaded
+                    pending_updates.append((existing_track, normalized_data))
+                    isrc = normalized_data.get('isrc')
+                    if isrc and isrc not in track_index['isrc']:
+                        track_index['isrc'][isrc] = existing_track
+                    tracks_skipped += 1
+                else:
+                    # Create a new track
+                    track = self._create_track(normalized_data)
+                    session.add(track)
+                    self._index_track(track_index, track, track.isrc,
+                                      track.title, track.artist_name)
+                    new_tracks.append(track)
+                    tracks_added += 1
+            
+            except Exception as e:
+                tracks_skipped += 1
+                error_msg = f"Error processing track: {e} - Data: {track_data}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+        
+        # Load all existing tracks that need updating in a single query
+        if pending_updates:
+            existing = {
+                track.track_id: track
+                for track in session.query(Track).filter(
+                    Track.track_id.in_({track_id for track_id, _ in pending_updates}))
+            }
+            for track_id, normalized_data in pending_updates:
+                track = existing.get(track_id)
+                isrc = normalized_data.get('isrc')
+                if track is not None:
+                    self._update_track(track, normalized_data)
+                    self._index_track(track_index, track_id, track.isrc,
+                                      track.title, track.artist_name)
+                # Drop the ISRC indexed above if the track kept another one
+                if (isrc and track_index['isrc'].get(isrc) == track_id
+                        and (track is None or track.isrc != isrc)):
+                    del track_index['isrc'][isrc]
+        
+        # Flush to assign IDs, then index new tracks by ID for later batches
+        session.flush()
+        for track in new_tracks:
+            self._index_track(track_index, track.track_id, track.isrc,
+                              track.title, track.artist_name)
+        
+        return tracks_added, tracks_skipped, errors
+    
     def _validate_track_data(self, track_data: Dict) -> bool:
         """Validate that a track has all required fields.
         
@@ -148,46 +242,83 @@ class CatalogImporter:
         
         return True
     
-    def _find_existing_track(self, session: Session, isrc: Optional[str], title: str, artist_name: str) -> Optional[Track]:
-        """Find an existing track in the database by ISRC, title, and artist.
+    def _load_track_index(self, session: Session) -> Dict[str, Dict]:
+        """Load an in-memory index of existing tracks for duplicate detection.
         
         Args:
             session: Database session
+        
+        Returns:
+            Dictionary with 'isrc' and 'title_artist' lookup tables mapping to track IDs
+        """
+        track_index = {'isrc': {}, 'title_artist': {}}
+        rows = session.execute(
+            select(Track.track_id, Track.isrc, Track.title, Track.artist_name))
+        for track_id, isrc, title, artist_name in rows:
+            self._index_track(track_index, track_id, isrc, title, artist_name)
+        
+        logger.debug(f"Loaded index of {len(track_index['title_artist'])} existing tracks")
+        return track_index
+    
+    def _index_track(self, track_index: Dict[str, Dict], track_ref: Union[int, Track],
+                     isrc: Optional[str], title: Optional[str], artist_name: Optional[str]) -> None:
+        """Add a track to the duplicate detection index.
+        
+        Args:
+            track_index: Index from _load_track_index
+            track_ref: Track ID, or the Track object itself if not yet flushed
+            isrc: Track ISRC code (may be None)
+            title: Track title
+            artist_name: Artist name
+        """
+        if isrc:
+            track_index['isrc'][isrc] = track_ref
+        if title and artist_name:
+            track_index['title_artist'][(title.lower(), artist_name.lower())] = track_ref
+    
+    def _discard_unflushed_tracks(self, track_index: Dict[str, Dict]) -> None:
+        """Remove index entries for tracks that were rolled back before being flushed.
+        
+        Args:
+            track_index: Index from _load_track_index
+        """
+        for lookup in track_index.values():
+            for key in [k for k, ref in lookup.items() if isinstance(ref, Track)]:
+                del lookup[key]
+    
+    def _find_existing_track(self, track_index: Dict[str, Dict], isrc: Optional[str],
+                             title: str, artist_name: str) -> Optional[Union[int, Track]]:
+        """Find an existing track by ISRC, title, and artist.
+        
+        Title and artist must match exactly apart from case; substrings of
+        an existing title or artist do not match.
+        
+        Args:
+            track_index: Index from _load_track_index
             isrc: Track ISRC code (normalized, may be None)
             title: Track title (normalized)
             artist_name: Artist name (normalized)
         
         Returns:
-            Track object if found, None otherwise
+            Track ID (or unflushed Track object) if found, None otherwise
         """
         # First, try to find by ISRC if provided (most reliable identifier)
         if isrc:
-            track = session.query(Track).filter(Track.isrc == isrc).first()
-            if track:
+            track_ref = track_index['isrc'].get(isrc)
+            if track_ref is not None:
                 logger.debug(f"Found track by ISRC: {isrc}")
-                return track
-        
-        # If not found by ISRC or ISRC not provided, try title and artist
-        # First try exact match
-        track = session.query(Track).filter(
-            Track.title == title,
-            Track.artist_name == artist_name
-        ).first()
+                return track_ref
         
-        if track:
-            logger.debug(f"Found track by exact title and artist match: {title} - {artist_name}")
-            return track
+        # If not found by ISRC or ISRC not provided, try case-insensitive title and artist
+        if not (title and artist_name):
+            return None
         
-        # If not found, try case-insensitive match
-        track = session.query(Track).filter(
-            Track.title.ilike(f"%{title}%"),
-            Track.artist_name.ilike(f"%{artist_name}%")
-        ).first()
+        track_ref = track_index['title_artist'].get((title.lower(), artist_name.lower()))
         
-        if track:
-            logger.debug(f"Found track by fuzzy title and artist match: {title} - {artist_name}")
+        if track_ref is not None:
+            logger.debug(f"Found track by title and artist match: {title} - {artist_name}")
         
-        return track
+        return track_ref
     
     def _create_track(self, track_data: Dict) -> Track:
         """Create a new Track object from track data.
@@ -5,7 +5,9 @@ import time
 from typing import Optional, Tuple, Dict
 import sqlalchemy
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,37 @@ connection_status_cache = {}
 CACHE_EXPIRATION = 300
 
 
+def create_db_engine(db_url: str, pool_size: int = 5, max_overflow: int = 10,
+                     pool_pre_ping: bool = False) -> Engine:
+    """Create a database engine with a connection pool sized for the workload.
+
+    SQLite URLs are configured so that connections can be shared across
+    threads; in-memory SQLite databases use a single static connection so
+    every session sees the same database.
+
+    Args:
+        db_url: Database connection string
+        pool_size: Number of pooled connections kept open (default: 5)
+        max_overflow: Extra connections allowed beyond pool_size (default: 10)
+        pool_pre_ping: Test connections before handing them out (default: False)
+
+    Returns:
+        SQLAlchemy engine
+    """
+    if db_url.startswith('sqlite'):
+        connect_args = {'check_same_thread': False}
+        if db_url in ('sqlite://', 'sqlite:///:memory:'):
+            return create_engine(db_url, connect_args=connect_args, poolclass=StaticPool)
+        return create_engine(db_url, connect_args=connect_args)
+
+    return create_engine(
+        db_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=pool_pre_ping
+    )
+
+
 def verify_database_connection(db_connection: str, retry_count: int = 1) -> Tuple[bool, Optional[str]]:
     """Verify that a database connection is valid.
     
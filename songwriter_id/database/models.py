@@ -1,6 +1,6 @@
 """Database models for the songwriter identification system."""
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, create_engine
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,6 +12,9 @@ class Track(Base):
     """Represents a music track in the catalog."""
 
     __tablename__ = "tracks"
+    __table_args__ = (
+        Index("idx_tracks_title_artist", "title", "artist_name"),
+    )
 
     track_id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False, index=True)
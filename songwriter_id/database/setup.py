@@ -44,7 +44,8 @@ def setup_database(db_url=None):
 
         if 'tracks' not in existing_tables:
             logger.info("Creating database tables...")
-            Base.metadata.create_all(engine)
+            with engine.begin() as conn:
+                Base.metadata.create_all(conn, checkfirst=True)
             logger.info("Database tables created successfully.")
         else:
             logger.info("Database tables already exist.")
@@ -4,11 +4,13 @@ import json
 import logging
 import os
 import sys
+import requests
 import yaml
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 
@@ -39,26 +41,41 @@ except ImportError:
     logging.warning(
         "AcoustID/Chromaprint not available. Tier 3 audio fingerprinting will be disabled.")
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger(__name__)
 
 
 class SongwriterIdentificationPipeline:
     """Main pipeline for identifying songwriter credits."""
 
-    def __init__(self, config_file: str, db_connection: str):
+    def __init__(self, config_file: str, db_connection: Optional[str] = None,
+                 config_dict: Optional[Dict] = None, db_engine: Optional[Engine] = None):
         """Initialize the pipeline with configuration.
 
         Args:
             config_file: Path to the configuration file
-            db_connection: Database connection string
+            db_connection: Database connection string (optional if db_engine is given)
+            config_dict: Already parsed configuration; if given, config_file is not read
+            db_engine: Existing, already verified engine to share instead of creating one
         """
+        if db_connection is None and db_engine is not None:
+            db_connection = db_engine.url.render_as_string(hide_password=False)
         self.config_file = config_file
         self.db_connection = db_connection
+        self.db_engine = db_engine
         self.connection_status = {}
         self.is_ready = False  # Flag to indicate if pipeline is ready to run
 
-        # Load configuration
-        self.config = self._load_config(config_file)
+        # Load configuration unless it was passed in pre-parsed
+        if config_dict is not None:
+            self.config = config_dict
+        else:
+            self.config = self._load_config(config_file)
 
         # Verify database connections before initializing
         if not self._verify_connections():
@@ -68,7 +85,7 @@ class SongwriterIdentificationPipeline:
 
         # Initialize database connection
         try:
-            self.engine = create_engine(db_connection)
+            self.engine = db_engine or create_engine(db_connection)
             self.Session = sessionmaker(bind=self.engine)
 
             # Test a simple query to verify connection
@@ -83,7 +100,8 @@ class SongwriterIdentificationPipeline:
             self.normalizer = TrackNormalizer()
             self.importer = CatalogImporter(
                 db_connection=db_connection,
-                normalizer=self.normalizer
+                normalizer=self.normalizer,
+                db_engine=self.engine
             )
 
             # Initialize API clients
@@ -105,9 +123,13 @@ class SongwriterIdentificationPipeline:
         Returns:
             True if all critical connections are available, False otherwise
         """
-        # Check songwriter database connection (critical)
-        success, error = verify_database_connection(
-            self.db_connection, retry_count=2)
+        # Check songwriter database connection (critical); a shared engine
+        # has already been verified by its owner
+        if self.db_engine is not None:
+            success, error = True, None
+        else:
+            success, error = verify_database_connection(
+                self.db_connection, retry_count=2)
         self.connection_status['main_database'] = (success, error)
 
         if not success:
@@ -154,8 +176,8 @@ class SongwriterIdentificationPipeline:
             return {}
 
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            with open(config_path, 'rb') as f:
+                config = yaml.load(f, Loader=_SafeLoader)
             logger.info(f"Loaded configuration from {config_file}")
             return config
         except Exception as e:
@@ -187,6 +209,9 @@ class SongwriterIdentificationPipeline:
                     db_connection_string = db_config.get('connection_string')
                     pool_size = db_config.get('pool_size', 5)
                     max_overflow = db_config.get('max_overflow', 10)
+                    pool_pre_ping = db_config.get('pool_pre_ping', False)
+                    pool_recycle = db_config.get('pool_recycle', 3600)
+                    pool_timeout = db_config.get('pool_timeout', 30)
 
                     if db_connection_string:
                         # Check if the connection is available
@@ -198,7 +223,10 @@ class SongwriterIdentificationPipeline:
                                 self.mb_client = MusicBrainzDatabaseClient(
                                     db_connection_string=db_connection_string,
                                     pool_size=pool_size,
-                                    max_overflow=max_overflow
+                                    max_overflow=max_overflow,
+                                    pool_pre_ping=pool_pre_ping,
+                                    pool_recycle=pool_recycle,
+                                    pool_timeout=pool_timeout
                                 )
                                 logger.info(
                                     "MusicBrainz database client initialized successfully.")
@@ -215,30 +243,38 @@ class SongwriterIdentificationPipeline:
                             "MusicBrainz database client enabled but no connection string provided")
                         success = False
 
-            if client_type == 'api' or (client_type == 'database' and not MUSICBRAINZ_DB_AVAILABLE) or self.mb_client is None:
-                # Use API client
-                if client_type == 'database' and not MUSICBRAINZ_DB_AVAILABLE:
-                    logger.warning(
-                        "MusicBrainzDatabaseClient not available, falling back to API client")
-
-                api_config = mb_config.get('api', {})
-                if api_config.get('enabled', True):
-                    logger.info("Initializing MusicBrainz API client")
-                    try:
-                        self.mb_client = MusicBrainzClient(
-                            app_name=api_config.get(
-                                'user_agent', 'SongwriterCreditsIdentifier'),
-                            version=api_config.get('version', '1.0'),
-                            contact=api_config.get(
-                                'contact', 'contact@example.com'),
-                            rate_limit=api_config.get('rate_limit', 1.0),
-                            retries=api_config.get('retries', 3)
-                        )
-                        logger.info(
-                            "MusicBrainz API client initialized successfully.")
-                    except Exception as e:
-                        logger.error(
-                            f"Error initializing MusicBrainz API client: {e}")
+            # Use API client, backed by the database client when one is available
+            # so lookups only go over the network when the replica has no answer
+            if client_type == 'database' and not MUSICBRAINZ_DB_AVAILABLE:
+                logger.warning(
+                    "MusicBrainzDatabaseClient not available, falling back to API client")
+
+            db_client = self.mb_client
+            api_config = mb_config.get('api', {})
+            if api_config.get('enabled', True):
+                logger.info("Initializing MusicBrainz API client")
+                try:
+                    self.mb_client = MusicBrainzClient(
+                        app_name=api_config.get(
+                            'user_agent', 'SongwriterCreditsIdentifier'),
+                        version=api_config.get('version', '1.0'),
+                        contact=api_config.get(
+                            'contact', 'contact@example.com'),
+                        rate_limit=api_config.get('rate_limit', 1.0),
+                        retries=api_config.get('retries', 3),
+                        # Requests through a session reuse connections and
+                        # can overlap, unlike those made by musicbrainzngs
+                        http_session=requests.Session(),
+                        timeout=api_config.get('timeout', 10.0),
+                        db_client=db_client,
+                        cache_path=api_config.get('cache_path')
+                    )
+                    logger.info(
+                        "MusicBrainz API client initialized successfully.")
+                except Exception as e:
+                    logger.error(
+                        f"Error initializing MusicBrainz API client: {e}")
+                    if db_client is None:
                         success = False
 
         # Initialize AcoustID client if enabled and available
@@ -346,12 +382,19 @@ class SongwriterIdentificationPipeline:
             tier2_identified = 0
             tier3_identified = 0
             unidentified = 0
+            batch_size = self.config.get('batch_size', 100)
+
+            for i, track in enumerate(pending_tracks):
+                # Look up MusicBrainz credits for the next batch of tracks at once
+                if i % batch_size == 0:
+                    mb_credits = self._prefetch_musicbrainz_credits(
+                        pending_tracks[i:i + batch_size])
 
-            for track in pending_tracks:
                 # Process through Tier 1
                 tier1_config = self.config.get('tier1', {})
                 if tier1_config.get('enabled', True):
-                    credits = self._tier1_metadata_identification(track)
+                    credits = self._tier1_metadata_identification(
+                        track, mb_credits.get(track.track_id))
                     if credits:
                         track.identification_status = 'identified_tier1'
                         track.confidence_score = self._evaluate_confidence(
@@ -413,11 +456,39 @@ class SongwriterIdentificationPipeline:
         finally:
             session.close()
 
-    def _tier1_metadata_identification(self, track: Track) -> List[SongwriterCredit]:
+    def _prefetch_musicbrainz_credits(self, tracks: List[Track]) -> Dict[int, List[Dict]]:
+        """Look up the MusicBrainz credits of several tracks in one batch for Tier 1.
+
+        Args:
+            tracks: Track objects to look up
+
+        Returns:
+            Credits in API format (dicts) keyed by track ID; empty if Tier 1
+            does not use MusicBrainz or the batch lookup failed
+        """
+        tier1_config = self.config.get('tier1', {})
+        if not (self.mb_client and tier1_config.get('enabled', True)
+                and 'musicbrainz' in tier1_config.get('sources', [])):
+            return {}
+
+        try:
+            results = self.mb_client.get_credits_batch(
+                [(track.title, track.artist_name, track.release_title) for track in tracks])
+        except Exception as e:
+            # Tracks missing from the result are looked up one at a time
+            logger.error(f"Error in MusicBrainz batch identification: {e}")
+            return {}
+
+        return {track.track_id: credits for track, credits in zip(tracks, results)}
+
+    def _tier1_metadata_identification(self, track: Track,
+                                       mb_credits: Optional[List[Dict]] = None) -> List[SongwriterCredit]:
         """Tier 1: Identify songwriter credits based on metadata.
 
         Args:
             track: Track object to process
+            mb_credits: MusicBrainz credits already looked up for the track
+                (optional); looked up now if not given
 
         Returns:
             List of identified songwriter credits
@@ -433,13 +504,17 @@ class SongwriterIdentificationPipeline:
 
         # Try MusicBrainz if enabled
         if 'musicbrainz' in tier1_sources and self.mb_client:
-            # Determine which client is being used (API or DB) for logging
-            client_type = "Database" if isinstance(
-                self.mb_client, MusicBrainzDatabaseClient) else "API"
+            # Determine which clients are being used (API and/or DB) for logging
+            if not isinstance(self.mb_client, MusicBrainzClient):
+                client_type = "Database"
+            elif self.mb_client.db_client is not None:
+                client_type = "Database and API"
+            else:
+                client_type = "API"
             logger.info(
                 f"Using MusicBrainz {client_type} client for identification")
 
-            mb_credits = self._try_musicbrainz_identification(track)
+            mb_credits = self._try_musicbrainz_identification(track, mb_credits)
 
             if mb_credits:
                 # Convert API credit format to SongwriterCredit objects
@@ -478,11 +553,14 @@ class SongwriterIdentificationPipeline:
 
         return identified_credits
 
-    def _try_musicbrainz_identification(self, track: Track) -> List[Dict]:
+    def _try_musicbrainz_identification(self, track: Track,
+                                        credits: Optional[List[Dict]] = None) -> List[Dict]:
         """Try to identify songwriter credits using MusicBrainz.
 
         Args:
             track: Track object to process
+            credits: Credits already looked up for the track (optional);
+                looked up now if not given
 
         Returns:
             List of credits in API format (dicts)
@@ -491,11 +569,12 @@ class SongwriterIdentificationPipeline:
             f"Trying MusicBrainz identification for '{track.title}' by '{track.artist_name}'")
         try:
             # Get songwriter credits by title and artist - both client types use the same method signature
-            credits = self.mb_client.get_credits_by_title_artist(
-                title=track.title,
-                artist=track.artist_name,
-                release=track.release_title
-            )
+            if credits is None:
+                credits = self.mb_client.get_credits_by_title_artist(
+                    title=track.title,
+                    artist=track.artist_name,
+                    release=track.release_title
+                )
 
             # Log results
             if credits:
@@ -508,14 +587,10 @@ class SongwriterIdentificationPipeline:
                 logger.info(
                     f"No MusicBrainz credits found for '{track.title}' by '{track.artist_name}'")
 
-            # Determine client type for logging
-            client_type = "musicbrainz_db" if isinstance(
-                self.mb_client, MusicBrainzDatabaseClient) else "musicbrainz_api"
-
             # Record the identification attempt details
             self._record_identification_attempt(
                 track_id=track.track_id,
-                source_used=client_type,
+                source_used=self._musicbrainz_source(credits),
                 query_performed=f"title='{track.title}', artist='{track.artist_name}', release='{track.release_title}'",
                 result=json.dumps(credits) if credits else "No results found",
                 confidence_score=max([c.get('confidence_score', 0)
@@ -526,14 +601,10 @@ class SongwriterIdentificationPipeline:
         except Exception as e:
             logger.error(f"Error in MusicBrainz identification: {e}")
 
-            # Determine client type for logging
-            client_type = "musicbrainz_db" if isinstance(
-                self.mb_client, MusicBrainzDatabaseClient) else "musicbrainz_api"
-
             # Record the failed attempt
             self._record_identification_attempt(
                 track_id=track.track_id,
-                source_used=client_type,
+                source_used=self._musicbrainz_source([]),
                 query_performed=f"title='{track.title}', artist='{track.artist_name}', release='{track.release_title}'",
                 result=f"Error: {e}",
                 confidence_score=0.0
@@ -541,6 +612,26 @@ class SongwriterIdentificationPipeline:
 
             return []
 
+    def _musicbrainz_source(self, credits: List[Dict]) -> str:
+        """Name the MusicBrainz source that answered, for identification attempts.
+
+        The API client serves lookups from its database client when it has
+        one, so the source is taken from the credits themselves.
+
+        Args:
+            credits: Credits returned by the MusicBrainz client
+
+        Returns:
+            "musicbrainz_db" or "musicbrainz_api"
+        """
+        if credits:
+            from_db = all(credit.get('source') == 'musicbrainz_db' for credit in credits)
+        else:
+            # Without credits, the last source asked was the web service
+            # unless only the database client is configured
+            from_db = not isinstance(self.mb_client, MusicBrainzClient)
+        return "musicbrainz_db" if from_db else "musicbrainz_api"
+
     def _tier2_enhanced_matching(self, track: Track) -> List[SongwriterCredit]:
         """Tier 2: Identify songwriter credits using enhanced matching techniques.
 
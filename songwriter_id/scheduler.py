@@ -26,6 +26,9 @@ class JobScheduler:
         self.active_jobs = {}
         self.polling_thread = None
         self.running = False
+        # ID of the job being processed, or None when idle; jobs run one at a
+        # time in the polling thread
+        self.current_job = None
         
     def start(self):
         """Start the job scheduler."""
@@ -168,7 +171,11 @@ class JobScheduler:
                     job_file.unlink()
                     
                     # Process the job
-                    self._process_job(job_id, job_spec, status_file)
+                    self.current_job = job_id
+                    try:
+                        self._process_job(job_id, job_spec, status_file)
+                    finally:
+                        self.current_job = None
                     
                 except Exception as e:
                     logger.error(f"Error processing job file {job_file}: {e}")
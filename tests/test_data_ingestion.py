@@ -9,6 +9,8 @@ import pandas as pd
 
 from songwriter_id.data_ingestion.parser import CatalogParser
 from songwriter_id.data_ingestion.normalizer import TrackNormalizer
+from songwriter_id.data_ingestion.importer import CatalogImporter
+from songwriter_id.database.models import Base, Track
 
 class TestCatalogParser(unittest.TestCase):
     """Test cases for the CatalogParser class."""
@@ -192,5 +194,46 @@ class TestTrackNormalizer(unittest.TestCase):
         self.assertEqual(result['release_title'], 'Test Album')
 
 
+class TestCatalogImporter(unittest.TestCase):
+    """Test cases for the CatalogImporter class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        db_path = os.path.join(self.temp_dir.name, 'test.db')
+        self.importer = CatalogImporter(f'sqlite:///{db_path}')
+        Base.metadata.create_all(self.importer.engine)
+    
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.importer.engine.dispose()
+        self.temp_dir.cleanup()
+    
+    def test_duplicate_detection(self):
+        """Test that duplicates are skipped within and across imports."""
+        tracks_data = [
+            {'title': 'Test Song', 'artist_name': 'Test Artist', 'isrc': 'USABC1234567'},
+            {'title': 'test song', 'artist_name': 'test artist'},
+            {'title': 'Another Song', 'artist_name': 'Test Artist'},
+        ]
+        
+        added, skipped, errors = self.importer.bulk_import_tracks(tracks_data, batch_size=2)
+        self.assertEqual((added, skipped, errors), (2, 1, []))
+        
+        # Re-importing updates existing tracks instead of adding new ones
+        added, skipped, errors = self.importer.bulk_import_tracks([
+            {'title': 'Another Song', 'artist_name': 'Test Artist', 'release_title': 'Test Album'},
+        ])
+        self.assertEqual((added, skipped, errors), (0, 1, []))
+        
+        session = self.importer.Session()
+        try:
+            self.assertEqual(session.query(Track).count(), 2)
+            track = session.query(Track).filter_by(title='Another Song').one()
+            self.assertEqual(track.release_title, 'Test Album')
+        finally:
+            session.close()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,12 @@
 """Tests for the MusicBrainz integration."""
 
+import os
 import unittest
+from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock, patch
 
 from songwriter_id.api.musicbrainz import MusicBrainzClient
+from songwriter_id.api.musicbrainz_db import MusicBrainzDatabaseClient
 from songwriter_id.database.models import Track, SongwriterCredit
 from songwriter_id.pipeline import SongwriterIdentificationPipeline
 
@@ -49,6 +52,41 @@ class TestMusicBrainzClient(unittest.TestCase):
         self.assertTrue('Test Song' in kwargs['query'])
         self.assertTrue('Test Artist' in kwargs['query'])
 
+    @patch('musicbrainzngs.search_recordings')
+    def test_search_recording_escapes_query(self, mock_search):
+        """Test that Lucene special characters in search terms are escaped."""
+        mock_search.return_value = {"recording-list": []}
+        
+        self.mb_client.search_recording('Say "Hello" (Live)', "AC/DC")
+        
+        args, kwargs = mock_search.call_args
+        self.assertEqual(
+            kwargs['query'],
+            'recording:"Say \\"Hello\\" \\(Live\\)" AND artist:"AC\\/DC"'
+        )
+
+    def test_search_recording_with_http_session(self):
+        """Test that searches through a shared HTTP session return musicbrainzngs shapes."""
+        http_session = MagicMock()
+        http_session.get.return_value.content = (
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<metadata xmlns="http://musicbrainz.org/ns/mmd-2.0#" '
+            b'xmlns:ns2="http://musicbrainz.org/ns/ext#-2.0">'
+            b'<recording-list count="1" offset="0">'
+            b'<recording id="test-id-1" ns2:score="100"><title>Test Song</title></recording>'
+            b'</recording-list></metadata>'
+        )
+        self.mb_client.http_session = http_session
+        
+        results = self.mb_client.search_recording("Test Song", "Test Artist")
+        
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["id"], "test-id-1")
+        self.assertEqual(results[0]["title"], "Test Song")
+        args, kwargs = http_session.get.call_args
+        self.assertTrue(args[0].endswith("/recording/"))
+        self.assertTrue('Test Song' in kwargs['params']['query'])
+
     @patch('musicbrainzngs.get_recording_by_id')
     @patch('musicbrainzngs.get_work_by_id')
     def test_get_work_credits(self, mock_get_work, mock_get_recording):
@@ -112,9 +150,209 @@ class TestMusicBrainzClient(unittest.TestCase):
         self.assertTrue(lyricist["confidence_score"] > 0.5)
         
         # Verify mocks were called correctly
-        mock_get_recording.assert_called_once_with("test-recording-id", includes=["work-rels", "artist-rels"])
+        mock_get_recording.assert_called_once_with(
+            "test-recording-id",
+            includes=["work-rels", "work-level-rels", "artist-rels", "label-rels"]
+        )
         mock_get_work.assert_called_once_with("test-work-id", includes=["artist-rels", "label-rels"])
 
+    @patch('musicbrainzngs.get_recording_by_id')
+    @patch('musicbrainzngs.get_work_by_id')
+    def test_get_work_credits_embedded_work_rels(self, mock_get_work, mock_get_recording):
+        """Test that work relationships embedded in the recording avoid work lookups."""
+        mock_get_recording.return_value = {
+            "recording": {
+                "id": "test-recording-id",
+                "title": "Test Song",
+                "work-relation-list": [
+                    {
+                        "work": {
+                            "id": "test-work-id",
+                            "title": "Test Song",
+                            "artist-relation-list": [
+                                {"type": "writer", "artist": {"id": "test-artist-id", "name": "Test Writer"}}
+                            ],
+                            "label-relation-list": [
+                                {"type": "publisher", "label": {"id": "test-label-id", "name": "Test Label"}}
+                            ]
+                        }
+                    }
+                ]
+            }
+        }
+        
+        credits = self.mb_client.get_work_credits("test-recording-id")
+        
+        self.assertEqual(
+            [(c["name"], c["role"]) for c in credits],
+            [("Test Writer", "composer"), ("Test Label", "publisher")]
+        )
+        mock_get_work.assert_not_called()
+
+    @patch('musicbrainzngs.get_recording_by_id')
+    @patch('musicbrainzngs.get_work_by_id')
+    def test_get_work_credits_cached(self, mock_get_work, mock_get_recording):
+        """Test that repeated lookups of shared recordings and works are memoized."""
+        mock_get_recording.side_effect = lambda recording_id, includes: {
+            "recording": {
+                "id": recording_id,
+                "title": "Test Song",
+                "work-relation-list": [{"work": {"id": "test-work-id", "title": "Test Song"}}]
+            }
+        }
+        mock_get_work.return_value = {
+            "work": {
+                "id": "test-work-id",
+                "title": "Test Song",
+                "artist-relation-list": [
+                    {"type": "composer", "artist": {"id": "test-artist-id", "name": "Test Composer"}}
+                ]
+            }
+        }
+        
+        for recording_id in ["test-recording-id", "test-recording-id", "other-recording-id"]:
+            credits = self.mb_client.get_work_credits(recording_id)
+            self.assertEqual([c["name"] for c in credits], ["Test Composer"])
+        
+        # Each recording is fetched once and the shared work only once
+        self.assertEqual(mock_get_recording.call_count, 2)
+        mock_get_work.assert_called_once()
+
+    @patch('musicbrainzngs.get_recording_by_id')
+    def test_persistent_cache_survives_new_client(self, mock_get_recording):
+        """Test that lookups are served from the persistent cache across clients."""
+        mock_get_recording.return_value = {"recording": {"id": "test-recording-id"}}
+
+        with TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, "mb_cache.sqlite")
+            for _ in range(2):
+                client = MusicBrainzClient(
+                    app_name="SongwriterCreditsTest",
+                    version="1.0",
+                    contact="test@example.com",
+                    rate_limit=0.01,
+                    cache_path=cache_path
+                )
+                recording = client.get_recording_by_id("test-recording-id")
+                client.response_cache.close()
+                self.assertEqual(recording, {"id": "test-recording-id"})
+
+        mock_get_recording.assert_called_once()
+
+    def test_get_credits_batch_dedupes_queries(self):
+        """Test that batch lookups run each distinct query once."""
+        credits = [{"name": "Test Writer", "role": "composer", "confidence_score": 0.9}]
+        with patch.object(self.mb_client, 'get_credits_by_title_artist',
+                          return_value=credits) as mock_get_credits:
+            results = self.mb_client.get_credits_batch([
+                ("Test Song", "Test Artist", None),
+                ("test song ", "TEST ARTIST", None),
+                ("Other Song", "Test Artist", "Test Album"),
+            ])
+        
+        self.assertEqual(mock_get_credits.call_count, 2)
+        self.assertEqual(results, [credits, credits, credits])
+        self.assertIsNot(results[0][0], results[1][0])
+
+    @patch('musicbrainzngs.search_recordings')
+    def test_search_recording_prefers_db_client(self, mock_search):
+        """Test that the database client is used first and the API only on a miss."""
+        self.mb_client.db_client = MagicMock()
+        self.mb_client.db_client.search_recording.return_value = [{"id": "db-id", "title": "Test Song"}]
+        mock_search.return_value = {"recording-list": [{"id": "api-id", "title": "Test Song"}]}
+        
+        results = self.mb_client.search_recording("Test Song", "Test Artist")
+        self.assertEqual(results[0]["id"], "db-id")
+        mock_search.assert_not_called()
+        
+        # Fall back to the web service when the database has no match
+        self.mb_client.db_client.search_recording.return_value = []
+        results = self.mb_client.search_recording("Test Song", "Test Artist")
+        self.assertEqual(results[0]["id"], "api-id")
+        mock_search.assert_called_once()
+
+
+    def test_get_credits_by_title_artist_prefers_db_client(self):
+        """Test that credits come from the database client without a web search."""
+        credits = [{"name": "Test Writer", "role": "composer", "confidence_score": 0.9,
+                    "source": "musicbrainz_db"}]
+        self.mb_client.db_client = MagicMock()
+        self.mb_client.db_client.get_credits_by_title_artist.return_value = credits
+        with patch.object(self.mb_client, 'search_recording_advanced') as mock_search:
+            results = self.mb_client.get_credits_by_title_artist("Test Song", "Test Artist")
+        
+        self.assertEqual(results, credits)
+        self.mb_client.db_client.get_credits_by_title_artist.assert_called_once_with(
+            "Test Song", "Test Artist", None)
+        mock_search.assert_not_called()
+
+    def test_get_credits_batch_prefers_db_client(self):
+        """Test that batch lookups go to the database first and the API only for misses."""
+        credits = [{"name": "Test Writer", "role": "composer", "confidence_score": 0.9}]
+        self.mb_client.db_client = MagicMock()
+        self.mb_client.db_client.get_credits_batch.return_value = [credits, []]
+        with patch.object(self.mb_client, 'get_credits_by_title_artist',
+                          return_value=[]) as mock_get_credits:
+            results = self.mb_client.get_credits_batch([
+                ("Test Song", "Test Artist", None),
+                ("Other Song", "Test Artist", None),
+            ])
+        
+        self.mb_client.db_client.get_credits_batch.assert_called_once()
+        mock_get_credits.assert_called_once_with("Other Song", "Test Artist", None)
+        self.assertEqual(results, [credits, []])
+
+class TestMusicBrainzDatabaseClient(unittest.TestCase):
+    """Test cases for the MusicBrainzDatabaseClient."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db_client = MusicBrainzDatabaseClient("sqlite:///:memory:")
+
+    def test_get_credits_batch_caches_searches(self):
+        """Test that searches differing only in case and whitespace hit the credits cache."""
+        recordings = [{"id": "test-recording-id", "title": "Test Song", "score": 1.0}]
+        credits = {"test-recording-id": [
+            {"name": "Test Writer", "role": "composer", "confidence_score": 0.9}]}
+        with patch.object(self.db_client, 'search_recording_advanced',
+                          return_value=recordings) as mock_search, \
+                patch.object(self.db_client, '_get_credits_bulk', return_value=credits):
+            results = self.db_client.get_credits_batch([
+                ("Test Song", "Test Artist", None),
+                ("test  song ", "TEST ARTIST", None),
+            ])
+            again = self.db_client.get_credits_by_title_artist("Test Song", "Test Artist")
+
+        mock_search.assert_called_once()
+        self.assertEqual(self.db_client.credits_cache_stats,
+                         {'hits': 2, 'misses': 1, 'size': 1})
+        self.assertEqual(results[0][0]["name"], "Test Writer")
+        self.assertEqual(results[1][0]["search_title"], "test  song ")
+        self.assertEqual(again, results[0])
+        self.assertIsNot(again[0], results[0][0])
+
+    def test_trigram_check_error_is_not_cached(self):
+        """Test that a failed pg_trgm check is retried rather than remembered."""
+        session = MagicMock()
+        session.execute.side_effect = Exception("connection dropped")
+        self.assertFalse(self.db_client._trigram_available(session))
+        session.rollback.assert_called_once()
+        
+        session.execute.side_effect = None
+        session.execute.return_value.first.return_value = (1,)
+        self.assertTrue(self.db_client._trigram_available(session))
+
+    def test_clear_cache(self):
+        """Test that clearing the cache discards memoized lookups."""
+        with patch.object(self.db_client, '_get_work_by_id',
+                          return_value={"id": "test-work-id"}) as mock_get_work:
+            self.db_client.get_work_by_id("test-work-id")
+            self.db_client.get_work_by_id("test-work-id")
+            self.db_client.clear_cache()
+            self.db_client.get_work_by_id("test-work-id")
+
+        self.assertEqual(mock_get_work.call_count, 2)
+
 
 class TestMusicBrainzPipelineIntegration(unittest.TestCase):
     """Test cases for MusicBrainz integration in the pipeline."""
@@ -188,5 +426,20 @@ class TestMusicBrainzPipelineIntegration(unittest.TestCase):
         )
 
 
+    def test_tier1_uses_prefetched_credits(self):
+        """Test that Tier 1 uses credits looked up in a batch instead of searching again."""
+        credits = [{"name": "Test Composer", "role": "composer", "confidence_score": 0.9,
+                    "source": "musicbrainz_db", "source_id": "test-work-id"}]
+        self.pipeline.mb_client.get_credits_batch.return_value = [credits]
+        
+        prefetched = self.pipeline._prefetch_musicbrainz_credits([self.track])
+        with patch.object(self.pipeline, '_record_identification_attempt'):
+            identified = self.pipeline._tier1_metadata_identification(
+                self.track, prefetched.get(self.track.track_id))
+        
+        self.assertEqual(prefetched, {1: credits})
+        self.assertEqual(identified[0].songwriter_name, "Test Composer")
+        self.pipeline.mb_client.get_credits_by_title_artist.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()